@@ -5,61 +5,134 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QScrollArea,
     QLabel,
+    QMessageBox,
 )
-from PyQt5.QtCore import QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import networkx as nx
 import matplotlib.pyplot as plt
-from algorithmes.coloration import welch_powell
+from matplotlib.colors import hsv_to_rgb
+from algorithmes.coloration import welch_powell, dsatur
 from algorithmes.kruskal_min import kruskal_mst
 from algorithmes.prim import prim_mst
 from algorithmes.prim_max import prim_max_mst
 from algorithmes.kruksal_max import kruskal_max_mst
+from algorithm_worker import BackgroundRun
+from animation_controls import AnimationControls
+from blit_manager import BlitManager
+from graph_operations import NODE_LABEL_LIMIT, WEIGHT_LABEL_LIMIT, draw_edges, draw_nodes
+
+available_colors = ["red", "blue", "green", "yellow", "purple", "orange"]
+
+
+def display_color(color_index):
+    # Couleurs nommées d'abord, puis des teintes espacées par le nombre d'or
+    if color_index < len(available_colors):
+        return available_colors[color_index]
+    hue = (color_index * 0.618033988749895) % 1.0
+    return tuple(hsv_to_rgb((hue, 0.65, 0.9)))
 
 
 class AnimationWindow(QMainWindow):
-    def __init__(self, G, pos, algorithm="welsh_powell", start_node=None):
+    def __init__(self, G, pos, algorithm="welsh_powell", start_node=None, cache=None):
         super().__init__()
         self.G = G.to_undirected()
         self.pos = pos
+        self.cache = cache
+        self.algorithm = algorithm
         self.initUI()
         self.stable_sets = {}
+        self.mst = nx.Graph()
+        self.color_map = None
+        self.events = []  # Tampon des étapes reçues, rejouées par la lecture
+        self.step_artists = []
+        self.tree_color = "green" if algorithm in ("prim", "primMax") else "blue"
+        self.draw_background(
+            "black" if algorithm in ("welsh_powell", "dsatur") else "lightgray"
+        )
+        tree_size = max(self.G.number_of_nodes() - 1, 0)
 
-        if algorithm == "welsh_powell":
-            self.color_map = welch_powell(self.G)
-            self.animation_steps = list(self.color_map.items())
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.update_graph_welsh_powell)
-            self.timer.start(1000)
+        if algorithm in ("welsh_powell", "dsatur"):
+            coloring = dsatur if algorithm == "dsatur" else welch_powell
             self.button = QPushButton("Trouver ensemble stable maximal", self)
             self.button.clicked.connect(self.findStableSet)
-            layout = QVBoxLayout()
-            self.setLayout(layout)
-
+            self.button.setEnabled(False)  # Disponible une fois la coloration finie
+            self.main_layout.addWidget(self.button)
+            self.start(
+                (algorithm,),
+                lambda emit: self.emit_coloring(coloring, emit),
+                total=self.G.number_of_nodes(),
+            )
         elif algorithm == "kruskal":
-            self.animation_steps = []
-            kruskal_mst(self.G, self.visualize_step_kruskal)
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.update_graph_kruskal)
-            self.timer.start(1000)
+            self.start(
+                ("kruskal",),
+                lambda emit: kruskal_mst(self.G, emit),
+                total=tree_size,
+            )
         elif algorithm == "prim":
-            self.animation_steps = []
-            prim_mst(self.G, start_node, self.visualize_step_prim)
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.update_graph_prim)
-            self.timer.start(1000)
+            self.start(
+                ("prim", start_node),
+                lambda emit: prim_mst(self.G, start_node, emit),
+                total=tree_size,
+            )
         elif algorithm == "primMax":
-            self.animation_steps = []
-            prim_max_mst(self.G, start_node, self.visualize_step_prim)
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.update_graph_prim)
-            self.timer.start(1000)
+            self.start(
+                ("primMax", start_node),
+                lambda emit: prim_max_mst(self.G, start_node, emit),
+                total=tree_size,
+            )
         elif algorithm == "kruskalMax":
-            self.animation_steps = []
-            kruskal_max_mst(self.G, self.visualize_step_kruskal)
-            self.timer = QTimer()
-            self.timer.timeout.connect(self.update_graph_kruskal)
-            self.timer.start(1000)
+            self.start(
+                ("kruskalMax",),
+                lambda emit: kruskal_max_mst(self.G, emit),
+                total=tree_size,
+            )
+
+    def start(self, key, run, total=None):
+        # L'algorithme tourne sur un thread de fond (BackgroundRun) ; les
+        # étapes arrivent au fil du calcul et la lecture commence dès la
+        # première. Le cache garde (étapes, résultat) par version du graphe
+        self.blit.snapshot()
+        cached_run = self.cache.get(key) if self.cache is not None else None
+        if cached_run is not None:
+            events, result = cached_run
+            self.receive_steps(events)
+            self.use_result(result)
+            self.controls.show_cached(len(events))
+            return
+        version = self.cache.version if self.cache is not None else None
+        self.controls.run(
+            BackgroundRun(run),
+            self.receive_steps,
+            lambda job: self.run_done(job, key, version),
+            total=total,
+        )
+
+    def emit_coloring(self, coloring, emit):
+        # Exécuté sur le thread de fond : une étape (sommet, couleur) par
+        # sommet, émise dès qu'il est coloré (annulation possible pendant
+        # le calcul)
+        return coloring(self.G, emit)
+
+    def receive_steps(self, steps):
+        self.events.extend(steps)
+
+    def run_done(self, job, key, version):
+        if job.error is not None:
+            QMessageBox.critical(self, "Erreur", str(job.error))
+            return
+        if self.cache is not None:
+            self.cache.put(key, (self.events, job.result), version)
+        self.use_result(job.result)
+
+    def use_result(self, result):
+        if self.algorithm in ("welsh_powell", "dsatur"):
+            self.color_map = result
+            self.button.setEnabled(True)
+
+    def closeEvent(self, event):
+        # Le calcul de fond n'a plus de destinataire
+        self.controls.stop()
+        super().closeEvent(event)
 
     def initUI(self):
         self.setWindowTitle("Animation")
@@ -75,89 +148,94 @@ class AnimationWindow(QMainWindow):
         self.ax.axis("off")
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
+        self.blit = BlitManager(self.canvas, self.ax)
+        self.controls = AnimationControls(self, self.advance, self.seek)
+        layout.addWidget(self.controls)
+        self.main_layout = layout
 
-    def update_graph_welsh_powell(self):
-        if self.animation_steps:
-            node, color = self.animation_steps.pop(0)
-            self.ax.clear()
-            node_colors = [self.color_map.get(n, "lightgray") for n in self.G.nodes()]
-            nx.draw(
-                self.G,
-                pos=self.pos,
-                ax=self.ax,
-                with_labels=True,
-                node_color=node_colors,
-                node_size=700,
-            )
-            self.canvas.draw()
-        else:
-            self.timer.stop()
+    def draw_background(self, edge_color):
+        # Graphe entier en gris, dessiné une seule fois : chaque étape ajoute
+        # ensuite ses artistes au fond mis en cache (BlitManager.commit)
+        nodes = list(self.G.nodes())
+        self.node_labels = len(nodes) <= NODE_LABEL_LIMIT
+        draw_nodes(
+            self.ax,
+            self.pos,
+            nodes,
+            ["lightgray"] * len(nodes),
+            labels=self.node_labels,
+            label_color="black",
+        )
+        draw_edges(
+            self.ax,
+            self.pos,
+            list(self.G.edges(data="weight", default=1)),
+            color=edge_color,
+            labels=False,
+            directed=False,
+        )
+        self.canvas.draw_idle()
 
-    def visualize_step_kruskal(self, mst):
-        self.animation_steps.append(mst)
+    def draw_colored_nodes(self, nodes, colors):
+        markers, texts = draw_nodes(
+            self.ax,
+            self.pos,
+            nodes,
+            colors,
+            labels=self.node_labels,
+            label_color="black",
+        )
+        return [markers, *texts]
 
-    def update_graph_kruskal(self):
-        if self.animation_steps:
-            mst = self.animation_steps.pop(0)
-            self.ax.clear()
-            nx.draw(
-                self.G,
-                pos=self.pos,
-                ax=self.ax,
-                with_labels=True,
-                node_color="lightgray",
-                node_size=700,
-                edge_color="lightgray",
+    def advance(self, start, end):
+        # Étapes start..end-1 dessinées en un lot par-dessus le fond (plusieurs
+        # étapes par image quand la lecture est rapide)
+        events = self.events[start:end]
+        if self.algorithm in ("welsh_powell", "dsatur"):
+            artists = self.draw_colored_nodes(
+                [node for node, _ in events], [display_color(color) for _, color in events]
             )
-            nx.draw(
-                mst,
-                pos=self.pos,
-                ax=self.ax,
-                with_labels=True,
-                node_color="blue",
-                node_size=700,
-                edge_color="blue",
-            )
-            edge_labels = nx.get_edge_attributes(mst, "weight")
-            nx.draw_networkx_edge_labels(
-                mst, self.pos, edge_labels=edge_labels, ax=self.ax
-            )
-            self.canvas.draw()
         else:
-            self.timer.stop()
-
-    def visualize_step_prim(self, mst):
-        self.animation_steps.append(mst)
+            artists = self.add_tree_edges(events, self.tree_color)
+        self.step_artists.extend(artists)
+        self.blit.commit(*artists)
+        self.blit.update()
 
-    def update_graph_prim(self):
-        if self.animation_steps:
-            mst = self.animation_steps.pop(0)
-            self.ax.clear()
-            nx.draw(
-                self.G,
-                pos=self.pos,
-                ax=self.ax,
-                with_labels=True,
-                node_color="lightgray",
-                node_size=700,
-                edge_color="lightgray",
-            )
-            nx.draw(
-                mst,
-                pos=self.pos,
-                ax=self.ax,
-                with_labels=True,
-                node_color="green",
-                node_size=700,
-                edge_color="green",
-            )
-            edge_labels = nx.get_edge_attributes(mst, "weight")
-            nx.draw_networkx_edge_labels(
-                mst, self.pos, edge_labels=edge_labels, ax=self.ax
-            )
-            self.canvas.draw()
+    def seek(self, position):
+        # Saut arbitraire : les étapes dessinées sont retirées et les
+        # position premières redessinées en un seul lot
+        self.blit.discard(*self.step_artists)
+        self.step_artists = []
+        self.mst = nx.Graph()
+        if position:
+            self.advance(0, position)
         else:
-            self.timer.stop()
+            self.blit.update()
+
+    def add_tree_edges(self, events, color):
+        # Seules les nouvelles arêtes de l'arbre, leurs poids et leurs
+        # extrémités sont dessinés
+        for event in events:
+            self.apply_step(event)
+        edges = [(u, v, weight) for _, u, v, weight in events]
+        lines, _, texts = draw_edges(
+            self.ax,
+            self.pos,
+            edges,
+            color=color,
+            linewidth=2,
+            labels=self.G.number_of_nodes() <= WEIGHT_LABEL_LIMIT,
+            directed=False,
+            label_color="black",
+        )
+        endpoints = [node for u, v, _ in edges for node in (u, v)]
+        return [lines, *self.draw_colored_nodes(endpoints, [color] * len(endpoints)), *texts]
+
+    def apply_step(self, event):
+        # Reconstruire l'arbre courant à partir des événements, arête par arête
+        kind, u, v, weight = event
+        if kind == "add_edge":
+            self.mst.add_edge(u, v, weight=weight)
 
     def findStableSet(self):
         self.stable_sets = self.get_stable_sets_from_colors(self.color_map)
@@ -183,7 +261,7 @@ class AnimationWindow(QMainWindow):
                 pos=self.pos,
                 ax=ax,
                 with_labels=True,
-                node_color=[color] * len(nodes),
+                node_color=[display_color(color)] * len(nodes),
                 node_size=700,
             )
             canvas = FigureCanvas(fig)
@@ -2,29 +2,24 @@ from PyQt5.QtWidgets import (
     QMainWindow,
     QVBoxLayout,
     QListWidget,
+    QListWidgetItem,
     QPushButton,
     QWidget,
     QMessageBox,
 )
-import pickle
-import os
+from PyQt5.QtCore import Qt
+import time
 
-from gui import save_user_data
+from session import get_current_user
+from storage import get_store
 
 
-def load_user_data():
-    if not os.path.exists("user_data.pkl"):
-        return {}
-    with open("user_data.pkl", "rb") as file:
-        data = pickle.load(file)
-        return data
-
-
-def get_current_user():
-    if os.path.exists("current_user.txt"):
-        with open("current_user.txt", "r") as file:
-            return file.read().strip()
-    return None
+def format_size(size):
+    for unit in ("o", "Ko", "Mo"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} Go"
 
 
 class CollectionWindow(QMainWindow):
@@ -62,12 +57,18 @@ class CollectionWindow(QMainWindow):
     def load_graphs(self):
         self.graph_list.clear()  # Nettoyer la liste avant de la remplir
         username = get_current_user()
-        user_data = load_user_data()
-        if username in user_data:
-            graphs = user_data[username].get("graphs", {})
+        store = get_store()
+        if store.user_exists(username):
+            # Seul l'index des métadonnées est lu : aucun graphe n'est ouvert ici
+            graphs = store.list_graph_info(username)
             if graphs:
-                for graph_name in graphs:
-                    self.graph_list.addItem(graph_name)
+                for graph_name, node_count, edge_count, modified, size in graphs:
+                    item = QListWidgetItem(
+                        f"{graph_name}  —  {node_count} sommets, {edge_count} arêtes, "
+                        f"{format_size(size)}, {time.strftime('%d/%m/%Y %H:%M', time.localtime(modified))}"
+                    )
+                    item.setData(Qt.UserRole, graph_name)
+                    self.graph_list.addItem(item)
             else:
                 # S'il n'y a pas de graphes à charger, informer l'utilisateur
                 QMessageBox.information(self, "Pas de graphes", "Vous n'avez aucun graphe enregistrer !")
@@ -76,7 +77,7 @@ class CollectionWindow(QMainWindow):
     def load_selected_graph(self):
         selected_items = self.graph_list.selectedItems()
         if selected_items:
-            graph_name = selected_items[0].text()
+            graph_name = selected_items[0].data(Qt.UserRole)
             from gui import GraphDesigner
 
             self.graph_designer = GraphDesigner()
@@ -95,7 +96,7 @@ class CollectionWindow(QMainWindow):
     def delete_selected_graph(self):
         selected_items = self.graph_list.selectedItems()
         if selected_items:
-            graph_name = selected_items[0].text()
+            graph_name = selected_items[0].data(Qt.UserRole)
             confirm = QMessageBox.question(
                 self,
                 "Confirmer la supression",
@@ -105,15 +106,14 @@ class CollectionWindow(QMainWindow):
             )
             if confirm == QMessageBox.Yes:
                 username = get_current_user()
-                user_data = load_user_data()
-                if username in user_data:
+                store = get_store()
+                if store.user_exists(username):
                     # Supprime le graphe de la liste des graphes de l'utilisateur
-                    del user_data[username]["graphs"][graph_name]
-                    save_user_data(user_data)
+                    store.delete_graph(username, graph_name)
                     self.load_graphs()  # Mettre à jour la liste des graphes après suppression
 
                     # Si la liste des graphes est vide après suppression, retour au menu principal
-                    if not user_data[username]["graphs"]:
+                    if not store.list_graphs(username):
                         QMessageBox.information(
                             self,
                             "Collection vide",
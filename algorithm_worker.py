@@ -0,0 +1,69 @@
+import time
+
+from background_job import BackgroundJob, Cancelled
+
+# Les étapes sont envoyées par paquets : au plus STEP_BATCH étapes, ou ce
+# qui s'est accumulé en FLUSH_INTERVAL secondes (la première étape arrive
+# donc vite à l'interface même si l'algorithme en produit beaucoup)
+STEP_BATCH = 512
+FLUSH_INTERVAL = 0.05
+MAX_PENDING_BATCHES = 64
+MAX_STEPS_PER_TAKE = 4096  # Au-delà, le reste attend le prochain appel
+
+
+class BackgroundRun(BackgroundJob):
+    # Exécute un algorithme sur un thread de fond. run(emit) appelle emit(étape)
+    # à chaque étape et renvoie le résultat final ; le thread de l'interface
+    # récupère les étapes par paquets avec take_steps(). Une annulation
+    # interrompt l'algorithme à sa prochaine étape
+    def __init__(self, run, max_pending=MAX_PENDING_BATCHES):
+        super().__init__(max_pending)
+        self.run = run
+        self.result = None
+
+    def work(self):
+        batch = []
+        flushed = [time.monotonic()]
+
+        def emit(step):
+            if self.cancelled:
+                raise Cancelled
+            batch.append(step)
+            now = time.monotonic()
+            if len(batch) >= STEP_BATCH or now - flushed[0] >= FLUSH_INTERVAL:
+                self.put(list(batch))
+                batch.clear()
+                flushed[0] = now
+
+        try:
+            self.result = self.run(emit)
+        except Cancelled:
+            raise
+        except Exception as e:
+            # Poids négatifs, cycle absorbant... : signalé par l'interface,
+            # après les étapes déjà calculées
+            self.error = e
+        if batch:
+            self.put(batch)
+
+    def take_steps(self, limit=MAX_STEPS_PER_TAKE):
+        # Étapes disponibles (sans attendre), dans l'ordre ; au plus environ
+        # limit par appel pour que l'interface reste réactive quand
+        # l'algorithme va plus vite qu'elle
+        steps = []
+        for batch in self.available():
+            steps.extend(batch)
+            if len(steps) >= limit:
+                break
+        return steps
+
+
+class StepTrace:
+    # Se passe en trace= à dijkstra / bellman_ford : chaque étape
+    # (marqueur, changements) est émise au lieu d'être enregistrée ; le
+    # thread de l'interface la rejoue dans sa DeltaTrace
+    def __init__(self, emit):
+        self.emit = emit
+
+    def record(self, marker, changes):
+        self.emit((marker, changes))
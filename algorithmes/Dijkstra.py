@@ -1,15 +1,56 @@
 import networkx as nx
 import heapq
 
+import numpy as np
 
-def dijkstra(graph, source, visualize_step=None):
-    # Vérifier la présence de poids négatifs dans le graphe
-    for u, v, data in graph.edges(data=True):
-        if data["weight"] < 0:
-            raise ValueError("Le graphe contient des poids négatifs. L'algorithme de Dijkstra ne peut pas être appliqué.")
+from algorithmes.csr_graph import CSRGraph
+
+
+def dijkstra(graph, source, visualize_step=None, target=None, trace=None):
+    # trace : DeltaTrace qui reçoit seulement les sommets modifiés à chaque étape
+    csr = CSRGraph.from_networkx(graph)
+    step = None
+    if visualize_step or trace is not None:
+        distances = {vertex: float("infinity") for vertex in graph.nodes()}
+        previous_nodes = {vertex: None for vertex in graph.nodes()}
+        distances[source] = 0
+        last = [None]
+
+        # Entre deux extractions, seuls les voisins du sommet précédent ont pu changer
+        def step(current, dist, prev):
+            changes = []
+            if last[0] is not None:
+                for i in csr.neighbors(last[0])[0].tolist():
+                    node = csr.nodes[i]
+                    if dist[i] != distances[node]:
+                        distances[node] = dist[i]
+                        previous_nodes[node] = csr.nodes[prev[i]]
+                        changes.append((node, dist[i], previous_nodes[node]))
+            last[0] = current
+            if trace is not None:
+                trace.record(csr.nodes[current], changes)
+            if visualize_step:
+                visualize_step(graph, csr.nodes[current], distances, previous_nodes)
+
+    target = None if target is None else csr.index[target]
+    dist, prev = dijkstra_csr(csr, csr.index[source], step, target)
+    return csr.to_dict(dist), csr.to_dict(prev, missing=-1)
 
-    distances = {vertex: float("infinity") for vertex in graph.nodes()}
-    previous_nodes = {vertex: None for vertex in graph.nodes()}
+
+def dijkstra_csr(csr, source, visualize_step=None, target=None):
+    # Avec une cible, on s'arrête dès qu'elle est fixée : les distances des
+    # sommets non encore fixés restent alors provisoires
+    _check_weights(csr)
+    distances, previous_nodes = _dijkstra(
+        csr.indptr.tolist(), csr.indices.tolist(), csr.weights.tolist(), source, visualize_step, target
+    )
+    return np.array(distances, dtype=np.float64), np.array(previous_nodes, dtype=np.int64)
+
+
+def _dijkstra(indptr, indices, weights, source, visualize_step=None, target=None):
+    # Boucle principale sur les listes du CSR (réutilisables d'une source à l'autre)
+    distances = [float("infinity")] * (len(indptr) - 1)
+    previous_nodes = [-1] * (len(indptr) - 1)
     distances[source] = 0
 
     pq = [(0, source)]
@@ -18,15 +59,88 @@ def dijkstra(graph, source, visualize_step=None):
         current_distance, current_vertex = heapq.heappop(pq)
 
         if visualize_step:
-            visualize_step(graph, current_vertex, distances, previous_nodes)
+            visualize_step(current_vertex, distances, previous_nodes)
         if distances[current_vertex] < current_distance:
             continue
+        if current_vertex == target:
+            break
 
-        for neighbor, data in graph[current_vertex].items():
-            distance = current_distance + data["weight"]
+        for k in range(indptr[current_vertex], indptr[current_vertex + 1]):
+            neighbor = indices[k]
+            distance = current_distance + weights[k]
             if distance < distances[neighbor]:
                 distances[neighbor] = distance
                 previous_nodes[neighbor] = current_vertex
                 heapq.heappush(pq, (distance, neighbor))
 
     return distances, previous_nodes
+
+
+def bidirectional_dijkstra(graph, source, target):
+    csr = CSRGraph.from_networkx(graph)
+    distance, path = bidirectional_dijkstra_csr(csr, csr.index[source], csr.index[target])
+    return distance, [csr.nodes[i] for i in path]
+
+
+def bidirectional_dijkstra_csr(csr, source, target):
+    # Recherche simultanée depuis la source (successeurs) et depuis la cible
+    # (prédécesseurs) ; renvoie (distance, chemin) ou (inf, []) sans chemin
+    _check_weights(csr)
+    if source == target:
+        return 0, [source]
+
+    n = csr.number_of_nodes()
+    sides = []
+    for graph in (csr, csr.reverse()):
+        sides.append((graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()))
+    distances = ([float("infinity")] * n, [float("infinity")] * n)
+    previous_nodes = ([-1] * n, [-1] * n)
+    settled = ([False] * n, [False] * n)
+    distances[0][source] = 0
+    distances[1][target] = 0
+    queues = ([(0, source)], [(0, target)])
+    best, meeting = float("infinity"), -1
+
+    while queues[0] and queues[1]:
+        # Arrêt : aucun chemin passant par les deux frontières ne peut améliorer best
+        if queues[0][0][0] + queues[1][0][0] >= best:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        other = 1 - side
+        current_distance, current_vertex = heapq.heappop(queues[side])
+        if settled[side][current_vertex]:
+            continue
+        settled[side][current_vertex] = True
+
+        indptr, indices, weights = sides[side]
+        dist, prev = distances[side], previous_nodes[side]
+        for k in range(indptr[current_vertex], indptr[current_vertex + 1]):
+            neighbor = indices[k]
+            distance = current_distance + weights[k]
+            if distance < dist[neighbor]:
+                dist[neighbor] = distance
+                prev[neighbor] = current_vertex
+                heapq.heappush(queues[side], (distance, neighbor))
+            if dist[neighbor] + distances[other][neighbor] < best:
+                best = dist[neighbor] + distances[other][neighbor]
+                meeting = neighbor
+
+    if meeting < 0:
+        return float("infinity"), []
+    path = []
+    node = meeting
+    while node >= 0:
+        path.append(node)
+        node = previous_nodes[0][node]
+    path.reverse()
+    node = previous_nodes[1][meeting]
+    while node >= 0:
+        path.append(node)
+        node = previous_nodes[1][node]
+    return best, path
+
+
+def _check_weights(csr):
+    # Vérifier la présence de poids négatifs dans le graphe
+    if csr.weights.size and csr.weights.min() < 0:
+        raise ValueError("Le graphe contient des poids négatifs. L'algorithme de Dijkstra ne peut pas être appliqué.")
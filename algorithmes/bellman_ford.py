@@ -1,21 +1,105 @@
-def bellman_ford(graph, source, visualize_step=None):
-    # Initialisation
-    distances = {node: float('infinity') for node in graph.nodes()}
-    predecessors = {node: None for node in graph.nodes()}
+from collections import deque
+
+import numpy as np
+
+from algorithmes.csr_graph import CSRGraph
+
+
+def bellman_ford(graph, source, visualize_step=None, method="spfa", trace=None):
+    # trace : DeltaTrace qui reçoit (sommet, distance, prédécesseur) à chaque relaxation
+    csr = CSRGraph.from_networkx(graph)
+    if method == "vectorized":
+        # Une passe entière est relâchée d'un coup : pas d'étapes à animer
+        if visualize_step or trace is not None:
+            raise ValueError("Le mode vectorisé ne peut pas être animé.")
+        dist, pred = bellman_ford_vectorized_csr(csr, csr.index[source])
+        return csr.to_dict(dist), csr.to_dict(pred, missing=-1)
+    if method != "spfa":
+        raise ValueError(f"Méthode inconnue : {method}")
+
+    step = None
+    if visualize_step or trace is not None:
+        distances = {node: float('infinity') for node in graph.nodes()}
+        predecessors = {node: None for node in graph.nodes()}
+        distances[source] = 0
+
+        # Seul v change à chaque relaxation : mettre à jour les dicts en O(1)
+        def step(u, v, dist, pred):
+            distances[csr.nodes[v]] = dist[v]
+            predecessors[csr.nodes[v]] = csr.nodes[u]
+            if trace is not None:
+                trace.record((csr.nodes[u], csr.nodes[v]), [(csr.nodes[v], dist[v], csr.nodes[u])])
+            if visualize_step:
+                visualize_step(graph, csr.nodes[u], csr.nodes[v], distances, predecessors)
+
+    dist, pred = bellman_ford_csr(csr, csr.index[source], step)
+    return csr.to_dict(dist), csr.to_dict(pred, missing=-1)
+
+
+def bellman_ford_csr(csr, source, visualize_step=None):
+    # Variante à file (SPFA) : seuls les arcs sortants des sommets dont la
+    # distance vient de changer sont relâchés, et l'algorithme s'arrête dès
+    # qu'une passe ne modifie plus rien (file vide)
+    n = csr.number_of_nodes()
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    weights = csr.weights.tolist()
+    distances = [float('infinity')] * n
+    predecessors = [-1] * n
     distances[source] = 0
 
-    # Relaxation des arêtes
-    for _ in range(len(graph.nodes()) - 1):
-        for u, v, data in graph.edges(data=True):
-            if distances[u] + data['weight'] < distances[v]:
-                distances[v] = distances[u] + data['weight']
+    queue = deque([source])
+    in_queue = [False] * n
+    in_queue[source] = True
+    # Sans cycle négatif, un sommet est remis en file au plus n - 1 fois
+    relax_count = [0] * n
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = False
+        distance_u = distances[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if distance_u + weights[k] < distances[v]:
+                distances[v] = distance_u + weights[k]
                 predecessors[v] = u
                 if visualize_step:
-                    visualize_step(graph, u, v, distances, predecessors)
+                    visualize_step(u, v, distances, predecessors)
+                if not in_queue[v]:
+                    relax_count[v] += 1
+                    # Vérification des cycles de poids négatif
+                    if relax_count[v] >= n:
+                        raise ValueError("Graph contains a negative weight cycle")
+                    queue.append(v)
+                    in_queue[v] = True
+
+    return np.array(distances, dtype=np.float64), np.array(predecessors, dtype=np.int64)
+
+
+def bellman_ford_vectorized_csr(csr, source):
+    # Relaxation de toutes les arêtes par passe avec un min-scatter NumPy
+    u, v, w = csr.edge_arrays()
+    w = w.astype(np.float64)
+    distances = np.full(csr.number_of_nodes(), np.inf)
+    predecessors = np.full(csr.number_of_nodes(), -1, dtype=np.int64)
+    distances[source] = 0
+
+    converged = False
+    for _ in range(csr.number_of_nodes() - 1):
+        candidates = distances[u] + w
+        relaxed = distances.copy()
+        np.minimum.at(relaxed, v, candidates)
+        improved = relaxed < distances
+        if not improved.any():
+            converged = True
+            break
+        # Prédécesseur : une arête qui atteint la nouvelle distance minimale
+        winners = improved[v] & (candidates == relaxed[v])
+        predecessors[v[winners]] = u[winners]
+        distances = relaxed
 
-    # Vérification des cycles de poids négatif
-    for u, v, data in graph.edges(data=True):
-        if distances[u] + data['weight'] < distances[v]:
-            raise ValueError("Graph contains a negative weight cycle")
+    # Vérification des cycles de poids négatif : une passe supplémentaire
+    if not converged and (distances[u] + w < distances[v]).any():
+        raise ValueError("Graph contains a negative weight cycle")
 
     return distances, predecessors
@@ -1,28 +1,102 @@
-import networkx as nx
-
-
-def welch_powell(G):
-
-    degrees = {node: G.degree(node) for node in G.nodes}
-    print("Degrees:", degrees)
-    sorted_nodes = sorted(degrees, key=degrees.get, reverse=True)
-    color_map = {}
-    available_colors = ["red", "blue", "green", "yellow", "purple", "orange"]
-
-    for current_color_index in range(len(available_colors)):
-        current_color = available_colors[current_color_index]
-        for node in sorted_nodes[:]:
-            if node not in color_map and all(
-                neighbor not in color_map or color_map[neighbor] != current_color
-                for neighbor in G.neighbors(node)
-            ):
-                color_map[node] = current_color
-                sorted_nodes.remove(node)
-        # Debuuuuug
-        print(
-            f"Nodes colored with {current_color}: {[node for node, color in color_map.items() if color == current_color]}"
-        )
-
-    print("Final color map:", color_map)
-
-    return color_map
+import heapq
+
+import numpy as np
+
+from algorithmes.csr_graph import CSRGraph
+
+
+# Les couleurs sont des entiers 0, 1, 2, ... sans limite ; la correspondance
+# avec des couleurs d'affichage se fait uniquement au moment du rendu
+
+
+# Le callback reçoit un événement (sommet, couleur) par sommet coloré, dans
+# l'ordre où l'algorithme les colore
+
+
+def welch_powell(G, callback=None):
+    csr = _undirected_csr(G)
+    return _color_map(csr, welch_powell_csr(csr, _node_callback(csr, callback)))
+
+
+def dsatur(G, callback=None):
+    csr = _undirected_csr(G)
+    return _color_map(csr, dsatur_csr(csr, _node_callback(csr, callback)))
+
+
+def welch_powell_csr(csr, callback=None):
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    sorted_nodes = np.argsort(-csr.degrees(), kind="stable").tolist()
+    colors = [-1] * csr.number_of_nodes()
+    # blocked[v] == c : un voisin de v a déjà reçu la couleur c pendant cette passe
+    blocked = [-1] * csr.number_of_nodes()
+
+    current_color = 0
+    while sorted_nodes:
+        remaining = []
+        for node in sorted_nodes:
+            if blocked[node] == current_color:
+                remaining.append(node)
+                continue
+            colors[node] = current_color
+            if callback:
+                callback(node, current_color)
+            for k in range(indptr[node], indptr[node + 1]):
+                blocked[indices[k]] = current_color
+        sorted_nodes = remaining
+        current_color += 1
+
+    return np.array(colors, dtype=np.int64)
+
+
+def dsatur_csr(csr, callback=None):
+    # DSatur : on colore d'abord le sommet dont les voisins utilisent le plus de
+    # couleurs différentes (degré en cas d'égalité), via un tas à entrées périmées
+    n = csr.number_of_nodes()
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    degrees = csr.degrees().tolist()
+    colors = [-1] * n
+    neighbor_colors = [set() for _ in range(n)]
+    heap = [(0, -degrees[node], node) for node in range(n)]
+    heapq.heapify(heap)
+
+    while heap:
+        saturation, _, node = heapq.heappop(heap)
+        if colors[node] >= 0 or -saturation != len(neighbor_colors[node]):
+            continue
+        used = neighbor_colors[node]
+        color = 0
+        while color in used:
+            color += 1
+        colors[node] = color
+        if callback:
+            callback(node, color)
+        neighbor_colors[node] = None
+        for k in range(indptr[node], indptr[node + 1]):
+            neighbor = indices[k]
+            if colors[neighbor] < 0 and color not in neighbor_colors[neighbor]:
+                neighbor_colors[neighbor].add(color)
+                heapq.heappush(
+                    heap, (-len(neighbor_colors[neighbor]), -degrees[neighbor], neighbor)
+                )
+
+    return np.array(colors, dtype=np.int64)
+
+
+def _undirected_csr(G):
+    return CSRGraph.from_networkx(G.to_undirected() if G.is_directed() else G)
+
+
+def _node_callback(csr, callback):
+    # Indices du CSR traduits en sommets du graphe
+    if not callback:
+        return None
+    return lambda node, color: callback((csr.nodes[node], color))
+
+
+def _color_map(csr, colors):
+    # Ordre des étapes d'animation : par couleur, puis par degré décroissant
+    order = np.argsort(-csr.degrees(), kind="stable")
+    order = order[np.argsort(colors[order], kind="stable")]
+    return {csr.nodes[i]: int(colors[i]) for i in order.tolist()}
@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class CSRGraph:
+    # Instantané immuable d'un graphe networkx : les sommets sont renumérotés
+    # 0..n-1 et les arcs sortants de i sont indices[indptr[i]:indptr[i + 1]]
+    __slots__ = ("nodes", "index", "indptr", "indices", "weights", "directed", "_reverse")
+
+    def __init__(self, nodes, indptr, indices, weights, directed=True):
+        self.nodes = tuple(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.indptr = _frozen(indptr, np.int64)
+        self.indices = _frozen(indices, np.int64)
+        self.weights = _frozen(weights)
+        self.directed = directed
+        self._reverse = None
+
+    def __reduce__(self):
+        # Seuls les tableaux voyagent (processus de calcul) ; index et cache sont reconstruits
+        return (CSRGraph, (self.nodes, self.indptr, self.indices, self.weights, self.directed))
+
+    @classmethod
+    def from_networkx(cls, graph, weight="weight"):
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        src, dst, w = [], [], []
+        for u, v, data in graph.edges(data=True):
+            src.append(index[u])
+            dst.append(index[v])
+            w.append(data.get(weight, 1))
+        src = np.array(src, dtype=np.int64)
+        dst = np.array(dst, dtype=np.int64)
+        w = _weight_array(w)
+        directed = graph.is_directed()
+        if not directed:
+            # Chaque arête non orientée est stockée dans les deux sens (boucles une seule fois)
+            not_loop = src != dst
+            src, dst, w = (
+                np.concatenate((src, dst[not_loop])),
+                np.concatenate((dst, src[not_loop])),
+                np.concatenate((w, w[not_loop])),
+            )
+        return cls._from_arrays(nodes, src, dst, w, directed)
+
+    @classmethod
+    def _from_arrays(cls, nodes, src, dst, w, directed):
+        order = np.argsort(src, kind="stable")
+        counts = np.bincount(src, minlength=len(nodes))
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(nodes, indptr, dst[order], w[order], directed)
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return int(self.indices.size)
+
+    def degrees(self):
+        return np.diff(self.indptr)
+
+    def neighbors(self, i):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def edge_arrays(self):
+        src = np.repeat(np.arange(len(self.nodes), dtype=np.int64), self.degrees())
+        return src, self.indices, self.weights
+
+    def reverse(self):
+        # Graphe transposé (prédécesseurs), construit une seule fois
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            src, dst, w = self.edge_arrays()
+            self._reverse = CSRGraph._from_arrays(self.nodes, dst, src, w, True)
+        return self._reverse
+
+    def to_dict(self, values, missing=None):
+        # Convertit un tableau indexé par sommet en dict {sommet: valeur}
+        if missing is None:
+            return dict(zip(self.nodes, values.tolist()))
+        return {
+            node: (None if value == missing else self.nodes[value])
+            for node, value in zip(self.nodes, values.tolist())
+        }
+
+
+def _frozen(values, dtype=None):
+    array = np.ascontiguousarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+
+def _weight_array(weights):
+    # Garder des poids entiers quand le graphe n'a que des entiers (affichage)
+    array = np.array(weights)
+    if array.size == 0 or array.dtype.kind not in "iuf":
+        return np.array(weights, dtype=np.float64)
+    if array.dtype.kind == "u":
+        return array.astype(np.int64)
+    return array
@@ -0,0 +1,74 @@
+import networkx as nx
+import numpy as np
+
+from algorithmes.csr_graph import CSRGraph
+
+
+class UnionFind:
+    # Ensembles disjoints sur les sommets 0..n-1 (union par rang, compression
+    # par moitié itérative : pas de récursion, même sur de longues chaînes)
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.components = n
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, set1, set2):
+        root1 = self.find(set1)
+        root2 = self.find(set2)
+        if root1 == root2:
+            return False
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+        self.components -= 1
+        return True
+
+
+def kruskal(graph, callback=None, maximum=False):
+    undirected_graph = graph.to_undirected()
+    csr = CSRGraph.from_networkx(undirected_graph)
+    mst = nx.Graph()
+
+    # Le callback reçoit un événement ("add_edge", u, v, poids) par arête acceptée
+    def add_edge(u, v, weight):
+        u, v = csr.nodes[u], csr.nodes[v]
+        mst.add_edge(u, v, weight=weight)
+        if callback:
+            callback(("add_edge", u, v, weight))
+
+    kruskal_csr(csr, add_edge, maximum)
+    # Forêt couvrante : les sommets isolés font aussi partie du résultat
+    mst.add_nodes_from(undirected_graph.nodes())
+    return mst
+
+
+def kruskal_csr(csr, callback=None, maximum=False):
+    # Arbre (ou forêt si le graphe n'est pas connexe) couvrant minimum,
+    # ou maximum avec maximum=True ; renvoie la liste des arêtes (u, v, poids)
+    uf = UnionFind(csr.number_of_nodes())
+    mst_edges = []
+
+    # Chaque arête non orientée apparaît deux fois dans le CSR : garder u <= v
+    src, dst, w = csr.edge_arrays()
+    keep = src <= dst
+    src, dst, w = src[keep], dst[keep], w[keep]
+    order = np.argsort(-w if maximum else w, kind="stable")
+
+    for u, v, weight in zip(src[order].tolist(), dst[order].tolist(), w[order].tolist()):
+        if uf.union(u, v):
+            mst_edges.append((u, v, weight))
+            if callback:
+                callback(u, v, weight)
+            if uf.components == 1:
+                break
+
+    return mst_edges
@@ -0,0 +1,70 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithmes.csr_graph import CSRGraph
+from algorithmes.Dijkstra import _check_weights, _dijkstra
+
+# Graphe du processus de calcul, reçu une seule fois à son démarrage
+_worker_graph = None
+
+
+def distance_matrix(graph, sources=None, max_workers=None):
+    # Matrice dense des distances : une ligne par source, colonnes dans l'ordre
+    # de graph.nodes() ; sources=None calcule toutes les paires
+    csr = CSRGraph.from_networkx(graph)
+    sources = list(graph.nodes()) if sources is None else list(sources)
+    matrix = distance_matrix_csr(csr, [csr.index[s] for s in sources], max_workers)
+    return sources, matrix
+
+
+def iter_distance_rows(graph, sources=None, max_workers=None):
+    # Version en flux : (source, ligne de distances) dès qu'un lot est calculé
+    csr = CSRGraph.from_networkx(graph)
+    sources = list(graph.nodes()) if sources is None else list(sources)
+    rows = iter_distance_rows_csr(csr, [csr.index[s] for s in sources], max_workers)
+    for source, row in zip(sources, rows):
+        yield source, row
+
+
+def distance_matrix_csr(csr, sources, max_workers=None):
+    matrix = np.empty((len(sources), csr.number_of_nodes()), dtype=np.float64)
+    for i, row in enumerate(iter_distance_rows_csr(csr, sources, max_workers)):
+        matrix[i] = row
+    return matrix
+
+
+def iter_distance_rows_csr(csr, sources, max_workers=None):
+    _check_weights(csr)
+    sources = list(sources)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(sources)))
+
+    if max_workers == 1:
+        _init_worker(csr)
+        for row in _distance_rows(sources):
+            yield row
+        return
+
+    # Lots de sources : quelques lots par processus pour équilibrer la charge
+    # sans payer un aller-retour par source
+    chunksize = max(1, len(sources) // (max_workers * 4))
+    chunks = [sources[i:i + chunksize] for i in range(0, len(sources), chunksize)]
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(csr,)) as executor:
+        for rows in executor.map(_distance_rows, chunks):
+            yield from rows
+
+
+def _init_worker(csr):
+    global _worker_graph
+    _worker_graph = (csr.indptr.tolist(), csr.indices.tolist(), csr.weights.tolist())
+
+
+def _distance_rows(sources):
+    indptr, indices, weights = _worker_graph
+    return np.array(
+        [_dijkstra(indptr, indices, weights, source)[0] for source in sources],
+        dtype=np.float64,
+    ).reshape(len(sources), len(indptr) - 1)
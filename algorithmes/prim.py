@@ -1,28 +1,47 @@
 import networkx as nx
 import heapq
 
+from algorithmes.csr_graph import CSRGraph
+
 def prim_mst(graph, start_node, callback=None):
     undirected_graph = graph.to_undirected()
+    csr = CSRGraph.from_networkx(undirected_graph)
     #graph faregh to store l'arbre t3na kima rhi mkhdoma
     mst = nx.Graph()
-    #set to track which sommets zednahom lel mst , tbda with the start_node
-    visited = set([start_node])
+
+    # Le callback reçoit un événement ("add_edge", u, v, poids) par arête acceptée
+    def add_edge(frm, to, weight):
+        frm, to = csr.nodes[frm], csr.nodes[to]
+        mst.add_edge(frm, to, weight=weight)
+        if callback:
+            callback(("add_edge", frm, to, weight))
+
+    prim_mst_csr(csr, csr.index[start_node], add_edge)
+    return mst
+
+def prim_mst_csr(csr, start, callback=None):
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    weights = csr.weights.tolist()
+    mst_edges = []
+    #tableau to track which sommets zednahom lel mst , tbda with the start
+    visited = [False] * csr.number_of_nodes()
+    visited[start] = True
     #priority queue where potential arcs ynzado to the mst
     #its organized b tari9a win les arcs li 3ndhom lowest poids are always at the top
-    edges = [(data['weight'], start_node, to) for to, data in undirected_graph[start_node].items()]
+    edges = [(weights[k], start, indices[k]) for k in range(indptr[start], indptr[start + 1])]
     heapq.heapify(edges)
 
-
     #while loop continue TantQue kayen the arc fel heap
     while edges:
         #removes and returns l'arc sghir ge3 (par poids) de l'arbre ,cet arc raho considered for addition to the mst
         weight, frm, to = heapq.heappop(edges)
-        if to not in visited:
-            visited.add(to)
-            mst.add_edge(frm, to, weight=weight)
-            for next_to, data in undirected_graph[to].items():
-                if next_to not in visited:
-                    heapq.heappush(edges, (data['weight'], to, next_to))
+        if not visited[to]:
+            visited[to] = True
+            mst_edges.append((frm, to, weight))
+            for k in range(indptr[to], indptr[to + 1]):
+                if not visited[indices[k]]:
+                    heapq.heappush(edges, (weights[k], to, indices[k]))
             if callback:
-                callback(mst.copy())
-    return mst
\ No newline at end of file
+                callback(frm, to, weight)
+    return mst_edges
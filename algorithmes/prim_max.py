@@ -1,26 +1,46 @@
 import networkx as nx
 import heapq
 
+from algorithmes.csr_graph import CSRGraph
+
 def prim_max_mst(graph, start_node, callback=None):
     undirected_graph = graph.to_undirected()
+    csr = CSRGraph.from_networkx(undirected_graph)
     # Initialiser un graph vide pour l'arbre couvrant maximum
     mst = nx.Graph()
-    # Ensemble pour suivre les sommets ajoutés à l'arbre couvrant maximum
-    visited = set([start_node])
+
+    # Le callback reçoit un événement ("add_edge", u, v, poids) par arête acceptée
+    def add_edge(frm, to, weight):
+        frm, to = csr.nodes[frm], csr.nodes[to]
+        mst.add_edge(frm, to, weight=weight)
+        if callback:
+            callback(("add_edge", frm, to, weight))
+
+    prim_max_mst_csr(csr, csr.index[start_node], add_edge)
+    return mst
+
+def prim_max_mst_csr(csr, start, callback=None):
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    weights = csr.weights.tolist()
+    mst_edges = []
+    # Tableau pour suivre les sommets ajoutés à l'arbre couvrant maximum
+    visited = [False] * csr.number_of_nodes()
+    visited[start] = True
     # File de priorité pour les arêtes, mais cette fois-ci avec des poids négatifs
-    edges = [(-data['weight'], start_node, to) for to, data in undirected_graph[start_node].items()]
+    edges = [(-weights[k], start, indices[k]) for k in range(indptr[start], indptr[start + 1])]
     heapq.heapify(edges)
 
     while edges:
         # Prendre l'arête avec le "poids le plus faible" (qui est en réalité le poids le plus élevé en négatif)
         weight, frm, to = heapq.heappop(edges)
         weight = -weight  # Convertir le poids en positif pour le stocker dans le MST
-        if to not in visited:
-            visited.add(to)
-            mst.add_edge(frm, to, weight=weight)
-            for next_to, data in undirected_graph[to].items():
-                if next_to not in visited:
-                    heapq.heappush(edges, (-data['weight'], to, next_to))
+        if not visited[to]:
+            visited[to] = True
+            mst_edges.append((frm, to, weight))
+            for k in range(indptr[to], indptr[to + 1]):
+                if not visited[indices[k]]:
+                    heapq.heappush(edges, (-weights[k], to, indices[k]))
             if callback:
-                callback(mst.copy())
-    return mst
+                callback(frm, to, weight)
+    return mst_edges
@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+
+class ResultCache:
+    # Cache LRU borné des résultats d'algorithmes pour un graphe donné ; chaque
+    # entrée est liée à la version du graphe au moment du calcul
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def set_version(self, version):
+        # Appelé à chaque modification du graphe : seules les entrées calculées
+        # sur une autre version sont périmées et supprimées
+        self.version = version
+        for key in [key for key in self._entries if key[0] != version]:
+            del self._entries[key]
+
+    def lookup(self, key, compute):
+        result = self.get(key)
+        if result is None:
+            result = compute()
+            self.put(key, result)
+        return result
+
+    def get(self, key):
+        # Résultat pour la version actuelle du graphe, ou None
+        full_key = (self.version, key)
+        if full_key in self._entries:
+            self._entries.move_to_end(full_key)
+            return self._entries[full_key]
+        return None
+
+    def put(self, key, result, version=None):
+        # version : version du graphe au lancement d'un calcul de fond ; le
+        # résultat est ignoré si le graphe a été modifié entre-temps
+        if version is not None and version != self.version:
+            return
+        self._entries[(self.version, key)] = result
+        self._entries.move_to_end((self.version, key))
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def cached(cache, key, compute):
+    # Les résultats mis en cache sont partagés : ne pas les modifier
+    if cache is None:
+        return compute()
+    return cache.lookup(key, compute)
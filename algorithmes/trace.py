@@ -0,0 +1,77 @@
+import numpy as np
+
+KEYFRAME_INTERVAL = 128  # Intervalle minimal entre deux keyframes
+
+
+class DeltaTrace:
+    # Trace d'animation compacte pour Dijkstra / Bellman-Ford : chaque étape ne
+    # garde que les sommets modifiés (sommet, distance, prédécesseur) ; un état
+    # complet (keyframe) est copié toutes les keyframe_interval étapes pour
+    # pouvoir reconstruire n'importe quelle étape à la demande. L'intervalle
+    # vaut au moins le nombre de sommets : une keyframe coûte O(V), soit O(1)
+    # amorti par étape. Les keyframes sont des tableaux NumPy indexés par la
+    # position du sommet (prédécesseur -1 : aucun)
+    def __init__(self, nodes, source, keyframe_interval=None):
+        self._nodes = list(nodes)
+        if keyframe_interval is None:
+            keyframe_interval = max(KEYFRAME_INTERVAL, len(self._nodes))
+        self.keyframe_interval = keyframe_interval
+        self._index = {node: i for i, node in enumerate(self._nodes)}
+        # Sommets suivis de None : l'indice -1 désigne l'absence de prédécesseur
+        self._node_array = np.empty(len(self._nodes) + 1, dtype=object)
+        self._node_array[:-1] = self._nodes
+        self.markers = []
+        self._offsets = [0]
+        self._vertices = []
+        self._distances = []
+        self._predecessors = []
+        distances = np.full(len(self._nodes), np.inf)
+        distances[self._index[source]] = 0
+        predecessors = np.full(len(self._nodes), -1, dtype=np.int64)
+        self._state = (distances, predecessors)
+        self._keyframes = [(distances.copy(), predecessors.copy())]
+        self._cursor = None
+
+    def __len__(self):
+        return len(self.markers)
+
+    def record(self, marker, changes):
+        # marker : sommet courant (Dijkstra) ou arc relâché (Bellman-Ford)
+        distances, predecessors = self._state
+        for vertex, distance, predecessor in changes:
+            self._vertices.append(vertex)
+            self._distances.append(distance)
+            self._predecessors.append(predecessor)
+            i = self._index[vertex]
+            distances[i] = distance
+            predecessors[i] = -1 if predecessor is None else self._index[predecessor]
+        self.markers.append(marker)
+        self._offsets.append(len(self._vertices))
+        if len(self.markers) % self.keyframe_interval == 0:
+            self._keyframes.append((distances.copy(), predecessors.copy()))
+
+    def frame(self, index):
+        # Renvoie (marker, distances, prédécesseurs) après l'étape index ; les
+        # dicts renvoyés sont partagés avec la trace et ne doivent pas être modifiés
+        if self._cursor is None or not (
+            self._cursor[0] <= index < self._cursor[0] + self.keyframe_interval
+        ):
+            keyframe = index // self.keyframe_interval
+            distances, predecessors = self._keyframes[keyframe]
+            self._cursor = [
+                keyframe * self.keyframe_interval - 1,
+                dict(zip(self._nodes, distances.tolist())),
+                dict(zip(self._nodes, self._node_array[predecessors].tolist())),
+            ]
+        position, distances, predecessors = self._cursor
+        for step in range(position + 1, index + 1):
+            for k in range(self._offsets[step], self._offsets[step + 1]):
+                distances[self._vertices[k]] = self._distances[k]
+                predecessors[self._vertices[k]] = self._predecessors[k]
+        self._cursor[0] = index
+        return self.markers[index], distances, predecessors
+
+    def changes(self, index):
+        # Sommets modifiés par l'étape index : [(sommet, distance, prédécesseur)]
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return list(zip(self._vertices[start:end], self._distances[start:end], self._predecessors[start:end]))
@@ -0,0 +1,163 @@
+from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QSlider,
+    QVBoxLayout,
+    QWidget,
+)
+
+from playback import DEFAULT_SPEED, SPEEDS, Playback
+
+POLL_INTERVAL = 50  # ms
+
+
+class AnimationControls(QWidget):
+    # Barre placée sous une animation :
+    # - progression du calcul lancé sur un thread de fond (BackgroundRun) et
+    #   bouton d'annulation ; les étapes reçues sont transmises à la fenêtre
+    #   au fil de l'eau (on_steps) et la lecture commence dès la première ;
+    # - lecture (Playback) : lecture/pause, barre de lecture pour sauter à
+    #   n'importe quelle étape, vitesse en étapes par seconde.
+    # advance, seek, finish et settle sont les fonctions de dessin de la
+    # fenêtre (voir Playback)
+    def __init__(self, parent, advance, seek, finish=None, settle=None):
+        super().__init__(parent)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        compute_row = QHBoxLayout()
+        layout.addLayout(compute_row)
+        self.progress = QProgressBar(self)
+        self.progress.setTextVisible(True)
+        compute_row.addWidget(self.progress)
+        self.cancel_button = QPushButton("Annuler", self)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel)
+        compute_row.addWidget(self.cancel_button)
+
+        playback_row = QHBoxLayout()
+        layout.addLayout(playback_row)
+        self.play_button = QPushButton("Pause", self)
+        self.play_button.clicked.connect(self.toggle_play)
+        playback_row.addWidget(self.play_button)
+        self.scrub_bar = QSlider(Qt.Horizontal, self)
+        # Saut au relâchement seulement : une reconstruction par position
+        # survolée serait trop coûteuse sur un grand graphe
+        self.scrub_bar.setTracking(False)
+        self.scrub_bar.valueChanged.connect(self.scrub)
+        playback_row.addWidget(self.scrub_bar)
+        self.position_label = QLabel(self)
+        playback_row.addWidget(self.position_label)
+        self.speed_box = QComboBox(self)
+        for speed in SPEEDS:
+            self.speed_box.addItem(f"{speed} étape/s" if speed == 1 else f"{speed} étapes/s", speed)
+        self.speed_box.setCurrentIndex(SPEEDS.index(DEFAULT_SPEED))
+        self.speed_box.currentIndexChanged.connect(
+            lambda index: self.playback.set_rate(self.speed_box.itemData(index))
+        )
+        playback_row.addWidget(self.speed_box)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+        self.job = None
+        self.received = 0
+        self.playback = Playback(
+            self, advance, seek, finish=finish, settle=settle, on_change=self.show_position
+        )
+        self.show_position()
+
+    def run(self, job, on_steps, on_done, total=None):
+        # total : nombre d'étapes attendu s'il est connu, sinon barre
+        # indéterminée
+        self.stop()
+        self.playback.clear()
+        self.job = job
+        self.on_steps, self.on_done = on_steps, on_done
+        self.received = 0
+        self.total = total
+        self.progress.setRange(0, total or 0)
+        self.progress.setValue(0)
+        self.progress.setFormat("Calcul en cours...")
+        self.cancel_button.setEnabled(True)
+        job.start()
+        self.poll_timer.start(POLL_INTERVAL)
+
+    def show_cached(self, steps):
+        # Résultat déjà en cache : rien à calculer, tout le tampon est là
+        self.stop()
+        self.playback.clear()
+        self.progress.setRange(0, 1)
+        self.progress.setValue(1)
+        self.progress.setFormat(f"{steps} étapes (en cache)")
+        self.cancel_button.setEnabled(False)
+        self.playback.extend(steps)
+        self.playback.close()
+
+    @property
+    def running(self):
+        return self.job is not None
+
+    def poll(self):
+        job = self.job
+        steps = job.take_steps()
+        if steps:
+            self.received += len(steps)
+            self.on_steps(steps)
+            self.playback.extend(len(steps))
+        if self.total:
+            self.progress.setValue(min(self.received, self.total))
+        self.progress.setFormat(f"Calcul : {self.received} étapes")
+        if job.done:
+            self.job = None
+            self.poll_timer.stop()
+            self.cancel_button.setEnabled(False)
+            self.progress.setRange(0, 1)
+            self.progress.setValue(1)
+            self.progress.setFormat(f"{self.received} étapes")
+            self.on_done(job)
+            self.playback.close()
+
+    def cancel(self):
+        # Les étapes déjà reçues restent consultables
+        if self.job is None:
+            return
+        self.stop()
+        self.progress.setFormat(f"Annulé après {self.received} étapes")
+        self.playback.pause()
+        self.playback.close()
+
+    def stop(self):
+        # Arrête le calcul en cours et la lecture (fermeture de la fenêtre,
+        # nouveau calcul)
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.poll_timer.stop()
+        self.playback.stop()
+        self.cancel_button.setEnabled(False)
+        self.progress.setRange(0, 1)
+
+    def toggle_play(self):
+        if self.playback.paused or not self.playback.playing and self.playback.complete:
+            self.playback.play()
+        else:
+            self.playback.pause()
+
+    def scrub(self, position):
+        if position != self.playback.position:
+            self.playback.seek(position)
+
+    def show_position(self):
+        playback = self.playback
+        self.scrub_bar.blockSignals(True)
+        self.scrub_bar.setRange(0, playback.length)
+        self.scrub_bar.setValue(playback.position)
+        self.scrub_bar.blockSignals(False)
+        self.position_label.setText(f"{playback.position} / {playback.length}")
+        playing = playback.playing or not playback.paused and not playback.complete
+        self.play_button.setText("Pause" if playing else "Lecture")
@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class Cancelled(Exception):
+    pass
+
+
+class BackgroundJob:
+    # Travail sur un thread de fond dont les résultats partiels passent au
+    # thread de l'interface par une file bornée : le thread de fond attend
+    # quand la file est pleine (la mémoire utilisée reste bornée) et une
+    # annulation le débloque et l'arrête. Les sous-classes implémentent
+    # work(), qui envoie ses éléments avec put() ; l'interface les récupère
+    # avec available(), sans attendre, et done passe à True après le dernier.
+    # Une exception de work() est rapportée dans error : la fin est toujours
+    # signalée, l'interface n'attend pas indéfiniment
+    # Sous-classes : algorithm_worker.BackgroundRun, graph_import.BackgroundImport
+    def __init__(self, max_pending):
+        self.done = False
+        self.error = None
+        self._items = queue.Queue(maxsize=max_pending)
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def work(self):
+        raise NotImplementedError
+
+    def _run(self):
+        try:
+            self.work()
+        except Cancelled:
+            return
+        except Exception as e:
+            self.error = e
+        try:
+            self.put(None)  # Fin du travail
+        except Cancelled:
+            pass
+
+    def put(self, item):
+        # Bloque tant que la file est pleine ; Cancelled en cas d'annulation
+        while not self._cancelled.is_set():
+            try:
+                self._items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise Cancelled
+
+    def available(self):
+        # Éléments déjà arrivés, dans l'ordre ; l'appelant peut s'arrêter
+        # avant la fin, le reste attend le prochain appel
+        while not self.done:
+            try:
+                item = self._items.get_nowait()
+            except queue.Empty:
+                return
+            if item is None:
+                self.done = True
+                return
+            yield item
@@ -0,0 +1,255 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from graph_import import parse_node
+
+# Exécution sans interface des algorithmes sur les graphes enregistrés :
+#   python batch.py <utilisateur> [--graphs g1 g2 ...] [--algorithms ...]
+#                   [--source N] [--workers N] [--output dossier]
+# Aucun import PyQt / matplotlib : chaque graphe est traité dans un processus
+# de calcul, qui écrit son résultat dans un fichier JSON
+
+ALGORITHMS = (
+    "dijkstra",
+    "bellman_ford",
+    "prim",
+    "prim_max",
+    "kruskal",
+    "kruskal_max",
+    "welsh_powell",
+    "dsatur",
+)
+# Algorithmes qui partent d'un sommet (--source)
+SOURCE_ALGORITHMS = {"dijkstra", "bellman_ford", "prim", "prim_max"}
+
+# Base ouverte une seule fois par processus de calcul
+_worker_store = None
+
+
+def run_dijkstra(G, source):
+    from algorithmes.Dijkstra import dijkstra
+
+    return _shortest_paths(source, *dijkstra(G, source))
+
+
+def run_bellman_ford(G, source):
+    from algorithmes.bellman_ford import bellman_ford
+
+    return _shortest_paths(source, *bellman_ford(G, source))
+
+
+def run_prim(G, source):
+    from algorithmes.prim import prim_mst
+
+    return _tree(prim_mst(G, source))
+
+
+def run_prim_max(G, source):
+    from algorithmes.prim_max import prim_max_mst
+
+    return _tree(prim_max_mst(G, source))
+
+
+def run_kruskal(G, source):
+    from algorithmes.kruskal_min import kruskal_mst
+
+    return _tree(kruskal_mst(G))
+
+
+def run_kruskal_max(G, source):
+    from algorithmes.kruksal_max import kruskal_max_mst
+
+    return _tree(kruskal_max_mst(G))
+
+
+def run_welsh_powell(G, source):
+    from algorithmes.coloration import welch_powell
+
+    return _coloring(welch_powell(G))
+
+
+def run_dsatur(G, source):
+    from algorithmes.coloration import dsatur
+
+    return _coloring(dsatur(G))
+
+
+def _shortest_paths(source, distances, predecessors):
+    return {
+        "source": source,
+        # JSON n'a pas d'infini : un sommet inaccessible a une distance null
+        "distances": {
+            str(node): (None if math.isinf(d) else d) for node, d in distances.items()
+        },
+        "predecessors": {str(node): p for node, p in predecessors.items()},
+    }
+
+
+def _tree(mst):
+    edges = [[u, v, d["weight"]] for u, v, d in mst.edges(data=True)]
+    return {"weight": sum(w for _, _, w in edges), "edges": edges}
+
+
+def _coloring(color_map):
+    return {
+        "colors": len(set(color_map.values())),
+        "coloring": {str(node): color for node, color in color_map.items()},
+    }
+
+
+def output_path(output_dir, name):
+    # Nom lisible suivi d'une empreinte du nom exact : deux graphes dont les
+    # noms ne diffèrent que par des caractères remplacés ("a b", "a?b")
+    # n'écrivent pas dans le même fichier
+    readable = re.sub(r"[^\w.-]", "_", name)
+    digest = hashlib.sha1(name.encode()).hexdigest()[:10]
+    return os.path.join(output_dir, f"{readable}-{digest}.json")
+
+
+def _init_worker(db_path):
+    global _worker_store
+    from storage import GraphStore
+
+    _worker_store = GraphStore(db_path, legacy_path=None)
+
+
+def run_graph(username, name, algorithms, source, output_dir):
+    # Charge un graphe, exécute les algorithmes demandés et écrit le résultat ;
+    # une erreur d'algorithme (poids négatif, cycle absorbant) est consignée
+    # dans le fichier sans arrêter les autres, tout comme une erreur sur le
+    # graphe lui-même (supprimé entre-temps, fichier illisible) : les autres
+    # graphes continuent
+    started = time.perf_counter()
+    try:
+        report = _run_algorithms(username, name, algorithms, source)
+        failed = [
+            algorithm for algorithm, result in report["results"].items() if "error" in result
+        ]
+    except Exception as e:
+        report = {"error": f"{type(e).__name__}: {e}"}
+        failed = list(algorithms)
+
+    path = output_path(output_dir, name)
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "user": username,
+                "graph": name,
+                **report,
+                "seconds": time.perf_counter() - started,
+            },
+            file,
+        )
+    os.replace(path + ".tmp", path)
+    return name, path, failed
+
+
+def _run_algorithms(username, name, algorithms, source):
+    import networkx as nx
+    from graph_format import fill_graph
+
+    graph_data = _worker_store.load_graph(username, name)
+    if graph_data is None:
+        raise ValueError("Graphe introuvable.")
+    G = nx.DiGraph()
+    fill_graph(G, graph_data)
+    if source is None:
+        source = next(iter(G.nodes()), None)
+    elif source not in G and str(source) in G:
+        source = str(source)  # Identifiants textuels (graphe importé)
+
+    results = {}
+    for algorithm in algorithms:
+        if source is None:
+            results[algorithm] = {"error": "Graphe vide."}
+            continue
+        if source not in G and algorithm in SOURCE_ALGORITHMS:
+            results[algorithm] = {"error": f"Sommet de départ inconnu : {source!r}"}
+            continue
+        try:
+            results[algorithm] = globals()["run_" + algorithm](G, source)
+        except ValueError as e:
+            results[algorithm] = {"error": str(e)}
+    return {
+        "nodes": G.number_of_nodes(),
+        "edges": G.number_of_edges(),
+        "results": results,
+    }
+
+
+def _completed(names, futures):
+    # (nom, future) dans l'ordre où les graphes se terminent
+    by_future = dict(zip(futures, names))
+    for future in as_completed(futures):
+        yield by_future[future], future
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Exécute les algorithmes sur les graphes enregistrés, sans interface."
+    )
+    parser.add_argument("user", help="utilisateur propriétaire des graphes")
+    parser.add_argument("--graphs", nargs="+", help="graphes à traiter (défaut : tous)")
+    parser.add_argument(
+        "--algorithms", nargs="+", choices=ALGORITHMS, default=list(ALGORITHMS)
+    )
+    parser.add_argument(
+        "--source", type=parse_node, help="sommet de départ (défaut : premier sommet)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default="batch_results")
+    parser.add_argument("--db", default=None, help="base de données (défaut : user_data.db)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from storage import DB_PATH, GraphStore
+
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    db_path = args.db or DB_PATH
+    # Ouverture dans le processus principal d'abord : migrations et reprise
+    # de user_data.pkl faites une seule fois avant de lancer les processus
+    store = GraphStore(db_path)
+    if not store.user_exists(args.user):
+        print(f"Utilisateur inconnu : {args.user}", file=sys.stderr)
+        return 2
+    names = store.list_graphs(args.user)
+    store.close()
+    if args.graphs:
+        missing = sorted(set(args.graphs) - set(names))
+        if missing:
+            print(f"Graphes introuvables : {', '.join(missing)}", file=sys.stderr)
+            return 2
+        names = args.graphs
+    os.makedirs(args.output, exist_ok=True)
+
+    failures = 0
+    workers = max(1, min(args.workers, len(names)))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(db_path,)) as executor:
+        futures = [
+            executor.submit(run_graph, args.user, name, args.algorithms, args.source, args.output)
+            for name in names
+        ]
+        for done, (name, future) in enumerate(_completed(names, futures), 1):
+            try:
+                name, path, failed = future.result()
+            except Exception as e:
+                # Processus de calcul arrêté, résultat impossible à écrire
+                print(f"[{done}/{len(names)}] {name} : {e}", file=sys.stderr)
+                failures += 1
+                continue
+            status = f"échecs : {', '.join(failed)}" if failed else "ok"
+            print(f"[{done}/{len(names)}] {name} -> {path} ({status})")
+            failures += bool(failed)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,34 @@
 import sys
 from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QPushButton, QMessageBox, QApplication
-from PyQt5.QtCore import QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import networkx as nx
-import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 from algorithmes.bellman_ford import bellman_ford
-
-def calculate_levels(graph):
-    levels = {node: 0 for node in graph.nodes()}
-    for node in graph.nodes():
-        levels[node] = len(list(graph.predecessors(node)))
-    return levels
-
-def update_positions(levels):
-    max_level = max(levels.values())
-    level_nodes = {i: [] for i in range(max_level + 1)}
-
-    for node, level in levels.items():
-        level_nodes[level].append(node)
-
-    new_pos = {}
-    for level, nodes in level_nodes.items():
-        num_nodes = len(nodes)
-        spacing = 1.0 / (num_nodes + 1)
-        for i, node in enumerate(nodes):
-            new_pos[node] = ((i + 1) * spacing, -level)
-    return new_pos
+from algorithmes.trace import DeltaTrace
+from algorithm_worker import BackgroundRun, StepTrace
+from animation_controls import AnimationControls
+from blit_manager import BlitManager
+from graph_layout import auto_layout
+from playback import LABELS_PER_FRAME, PendingLabels
+from spatial_index import SpatialIndex
+from graph_operations import NODE_LABEL_LIMIT, WEIGHT_LABEL_LIMIT, draw_edges, draw_nodes, edge_geometry, fit_view
 
 class BellmanFordWindow(QMainWindow):
-    def __init__(self, G):
+    def __init__(self, G, pos=None, cache=None):
         super().__init__()
         self.G = G
+        self.cache = cache
         self.source_node = None
         self.target_node = None
-        self.animation_steps = []
+        self.trace = None
         self.path = None
 
-        # Calculate initial positions based on levels
-        self.initial_levels = calculate_levels(self.G)
-        self.pos = update_positions(self.initial_levels)
+        # Positions de l'éditeur ; auto_layout (en couches pour un graphe sans
+        # circuit) seulement s'il en manque
+        if pos is None or any(node not in pos for node in G):
+            pos = auto_layout(G)
+        self.pos = pos
         self.initUI()
         self.draw_graph()
 
@@ -57,29 +45,60 @@ class BellmanFordWindow(QMainWindow):
         self.ax.axis("off")
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
+        self.blit = BlitManager(self.canvas, self.ax)
+
+        self.controls = AnimationControls(
+            self, self.advance, self.seek, finish=self.show_path, settle=self.flush_distances
+        )
+        layout.addWidget(self.controls)
 
         self.start_button = QPushButton("recommencer", self)
         self.start_button.clicked.connect(self.reset)
         layout.addWidget(self.start_button)
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_visual)
-
         self.canvas.mpl_connect("button_press_event", self.on_click_bellman_ford)
 
     def start_bellman_ford(self):
         if self.source_node and self.target_node:
-            try:
-                distances, predecessors = bellman_ford(self.G, self.source_node, self.visualize_step)
+            self.path = None
+            self.path_artists = []
+            self.blit.snapshot()
+            self.show_initial_distances()
+            key = ("bellman_ford", self.source_node)
+            cached_run = self.cache.get(key) if self.cache is not None else None
+            if cached_run is not None:
+                self.trace, _, predecessors = cached_run
                 self.path = self.extract_path(predecessors, self.source_node, self.target_node)
-                self.timer.start(1000)
-            except ValueError as e:
-                QMessageBox.critical(self, "Error", str(e))
-                self.timer.stop()
+                self.controls.show_cached(len(self.trace))
+                return
+            # Calcul sur une copie du graphe, sur un thread de fond ; la trace
+            # est remplie ici au fil des étapes reçues
+            self.trace = DeltaTrace(self.G.nodes(), self.source_node)
+            graph, source = self.G.copy(), self.source_node
+            version = self.cache.version if self.cache is not None else None
+            self.controls.run(
+                BackgroundRun(lambda emit: bellman_ford(graph, source, trace=StepTrace(emit))),
+                self.receive_steps,
+                lambda job: self.run_done(job, key, version),
+            )
+
+    def receive_steps(self, steps):
+        for marker, changes in steps:
+            self.trace.record(marker, changes)
+
+    def run_done(self, job, key, version):
+        if job.error is not None:
+            QMessageBox.critical(self, "Error", str(job.error))
+            return
+        distances, predecessors = job.result
+        if self.cache is not None:
+            self.cache.put(key, (self.trace, distances, predecessors), version)
+        self.path = self.extract_path(predecessors, self.source_node, self.target_node)
 
     def on_click_bellman_ford(self, event):
-        x_click, y_click = event.xdata, event.ydata
-        closest_node = min(self.G.nodes, key=lambda node: np.hypot(self.pos[node][0] - x_click, self.pos[node][1] - y_click))
+        if event.xdata is None:
+            return
+        closest_node = self.spatial_index.nearest_node(event.xdata, event.ydata)
         if not self.source_node:
             self.source_node = closest_node
             self.highlight_node(self.source_node, "green")
@@ -90,25 +109,70 @@ class BellmanFordWindow(QMainWindow):
             self.start_bellman_ford()
 
     def highlight_node(self, node, color):
-        nx.draw_networkx_nodes(self.G, self.pos, nodelist=[node], node_color=color, ax=self.ax, node_size=500)
-        self.canvas.draw()
+        markers, texts = draw_nodes(self.ax, self.pos, [node], [color], size=500)
+        self.blit.commit(markers, *texts)
+        self.blit.update()
 
     def draw_graph(self):
+        # Fond statique dessiné une seule fois ; l'arc relâché est le seul
+        # artiste animé
+        self.blit.reset()
+        self.spatial_index = SpatialIndex(self.G, self.pos)
         self.ax.clear()
-        nx.draw(self.G, self.pos, ax=self.ax, with_labels=True, node_color='lightblue', edge_color='gray')
-        self.draw_edge_weights()
-        self.canvas.draw()
+        self.ax.axis("off")
+        fit_view(self.ax, self.pos)
+        nodes = list(self.G.nodes())
+        draw_nodes(
+            self.ax,
+            self.pos,
+            nodes,
+            ["lightblue"] * len(nodes),
+            labels=len(nodes) <= NODE_LABEL_LIMIT,
+            label_color="black",
+        )
+        self.edges = list(self.G.edges(data="weight", default=1))
+        self.weight_labels = len(self.edges) <= WEIGHT_LABEL_LIMIT
+        draw_edges(self.ax, self.pos, self.edges, color="gray", labels=self.weight_labels, label_color="blue")
+        self.relaxed_edge = LineCollection([], colors="orange", linewidths=2, zorder=1)
+        self.ax.add_collection(self.relaxed_edge, autolim=False)
+        self.blit.add(self.relaxed_edge)
+        self.current_label = self.blit.add(self.distance_label(0, 0, ""))
+        self.current_label.set_visible(False)
+        self.all_labels = len(self.pos) <= NODE_LABEL_LIMIT
+        self.distance_labels = {}
+        self.pending = PendingLabels(self.show_distances)
+        self.canvas.draw_idle()
+
+    def show_initial_distances(self):
+        # "inf" partout sauf à la source ; au-delà de NODE_LABEL_LIMIT, seule
+        # la distance de la source est écrite
+        distances = []
+        if self.all_labels:
+            distances = [(node, float("inf")) for node in self.pos if node != self.source_node]
+        self.show_distances(distances + [(self.source_node, 0)])
 
-    def draw_edge_weights(self):
-        edge_labels = nx.get_edge_attributes(self.G, 'weight')
-        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels=edge_labels, ax=self.ax, font_color='blue')
+    def show_distances(self, distances):
+        # Étiquettes de largeur fixe sur fond opaque : seule l'étiquette d'un
+        # sommet modifié est redessinée, par-dessus l'ancienne
+        labels, replaced = [], []
+        for node, dist in distances:
+            x, y = self.pos[node]
+            text = f"{dist:.1f}" if dist != float('inf') else "inf"
+            label = self.distance_label(x, y + 0.05, f"{text:>8}")
+            replaced.append(self.distance_labels.get(node))
+            self.distance_labels[node] = label
+            labels.append(label)
+        self.blit.commit(*labels, replaces=replaced)
+
+    def distance_label(self, x, y, text):
+        return self.ax.text(
+            x, y, text, family="monospace", fontsize=8, ha='center', zorder=4,
+            bbox=dict(facecolor='white', edgecolor='black', boxstyle='round,pad=0.3'),
+        )
 
     def run_bellman_ford(self):
         if self.source_node is not None and self.target_node is not None:
-            self.animation_steps = []
-            distances, predecessors = bellman_ford(self.G, self.source_node, self.visualize_step)
-            self.shortest_path = self.extract_path(predecessors, self.source_node, self.target_node)
-            self.timer.start(1000)
+            self.start_bellman_ford()
         else:
             QMessageBox.warning(self, "Attention", "Veuillez sélectionner à la fois les nœuds source et cible avant d'exécuter Bellman-Ford.")
 
@@ -124,40 +188,80 @@ class BellmanFordWindow(QMainWindow):
             QMessageBox.warning(self, "Erreur", "Aucun chemin trouvé de la source à la cible.")
             return []
 
-    def update_visual(self):
-        if self.animation_steps:
-            u, v, distances, predecessors = self.animation_steps.pop(0)
-            self.ax.clear()
+    def advance(self, start, end):
+        # Étapes start..end-1 en une image : le dernier arc relâché (animé)
+        # et les distances modifiées, dont au plus LABELS_PER_FRAME sont
+        # écrites par image
+        edge, distances, _ = self.trace.frame(end - 1)
+        self.show_relaxed_edge(edge, distances[edge[1]])
+        if self.all_labels:
+            for step in range(start, end):
+                self.pending.update((node, dist) for node, dist, _ in self.trace.changes(step))
+            self.pending.flush(LABELS_PER_FRAME)
+        self.blit.update()
 
-            # Draw nodes and edges
-            nx.draw(self.G, pos=self.pos, ax=self.ax, with_labels=True, node_color='lightblue')
-            nx.draw_networkx_edges(self.G, pos=self.pos, ax=self.ax, edgelist=[(u, v)], edge_color='orange', width=2)
+    def seek(self, position):
+        # Saut arbitraire : état reconstruit depuis la keyframe la plus
+        # proche de la trace, étiquettes de distance réécrites
+        self.blit.discard(*self.distance_labels.values(), *self.path_artists)
+        self.distance_labels = {}
+        self.path_artists = []
+        self.pending.clear()
+        if position == 0:
+            self.relaxed_edge.set_visible(False)
+            self.current_label.set_visible(False)
+            self.show_initial_distances()
+        else:
+            edge, distances, _ = self.trace.frame(position - 1)
+            self.show_relaxed_edge(edge, distances[edge[1]])
+            if self.all_labels:
+                self.show_distances(list(distances.items()))
+            else:
+                self.show_initial_distances()
+        self.blit.update()
 
-            # Show distances on nodes with a box above each node
-            for node, (x, y) in self.pos.items():
-                dist = f"{distances[node]:.1f}" if distances[node] != float('inf') else "inf"
-                self.ax.text(x, y + 0.1, dist, bbox=dict(facecolor='white', edgecolor='black', boxstyle='round,pad=0.3'), fontsize=8, ha='center')
+    def flush_distances(self):
+        # Lecture arrêtée : les distances différées sont écrites
+        self.pending.flush()
+        self.blit.update()
 
-            self.draw_edge_weights()
-            self.canvas.draw()
-        else:
-            self.timer.stop()
-            if self.path:
-                # Visualization of the shortest path
-                path_edges = list(zip(self.path[:-1], self.path[1:]))
-                nx.draw_networkx_edges(self.G, pos=self.pos, edgelist=path_edges, edge_color='red', width=2, ax=self.ax)
-                self.draw_edge_weights()  # Re-draw edge weights to ensure they are not obstructed
-                self.canvas.draw()
+    def show_relaxed_edge(self, edge, dist):
+        # Au-delà de NODE_LABEL_LIMIT sommets, seule la distance de
+        # l'extrémité de l'arc relâché est écrite, dans une étiquette animée
+        curves, _, _ = edge_geometry(self.ax, self.pos, [edge])
+        self.relaxed_edge.set_segments(curves)
+        self.relaxed_edge.set_visible(True)
+        if not self.all_labels:
+            x, y = self.pos[edge[1]]
+            self.current_label.set_position((x, y + 0.05))
+            self.current_label.set_text(f"{dist:>8.1f}")
+            self.current_label.set_visible(True)
 
-    def visualize_step(self, graph, u, v, distances, predecessors):
-        self.animation_steps.append((u, v, dict(distances), dict(predecessors)))
+    def show_path(self):
+        self.relaxed_edge.set_visible(False)
+        self.current_label.set_visible(False)
+        if self.path:
+            # Visualization of the shortest path, weights drawn on top
+            path_edges = [
+                (u, v, self.G[u][v]["weight"]) for u, v in zip(self.path[:-1], self.path[1:])
+            ]
+            lines, heads, texts = draw_edges(
+                self.ax, self.pos, path_edges, color='red', linewidth=2,
+                labels=self.weight_labels, label_color='blue',
+            )
+            self.path_artists = [lines, heads, *texts]
+            self.blit.commit(*self.path_artists)
+        self.blit.update()
+
+    def closeEvent(self, event):
+        self.controls.stop()
+        super().closeEvent(event)
 
     def reset(self):
+        self.controls.stop()
+        self.controls.playback.clear()
         self.source_node = None
         self.target_node = None
-        self.ax.clear()
-        self.pos = update_positions(self.initial_levels)  # Restore initial positions
         self.draw_graph()
-        self.canvas.draw()
         self.start_button.setEnabled(False)  # Disable start button until nodes are selected again
         self.canvas.mpl_connect("button_press_event", self.on_click_bellman_ford)
\ No newline at end of file
@@ -0,0 +1,80 @@
+class BlitManager:
+    # Animation par blitting : le fond (graphe statique et tout ce qui a déjà
+    # été ajouté pour de bon) est gardé en mémoire sous forme de pixels ; une
+    # image ne redessine que les artistes qui changent.
+    # - commit(*artistes) : artistes permanents, dessinés une seule fois
+    #   par-dessus le fond puis intégrés au fond mis en cache ;
+    # - add(artiste) : artiste animé, redessiné à chaque update().
+    # Après un redessin complet (premier affichage, redimensionnement), le fond
+    # est recapturé : les artistes permanents en font partie naturellement
+    def __init__(self, canvas, ax):
+        self.canvas = canvas
+        self.ax = ax
+        self.background = None
+        self.base = None  # Fond sauvé par snapshot()
+        self.animated = []
+        canvas.mpl_connect("draw_event", self.on_draw)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.base = None  # Taille ou contenu changés
+        self._draw_animated()
+
+    def add(self, artist):
+        artist.set_animated(True)
+        self.animated.append(artist)
+        return artist
+
+    def reset(self):
+        # Retire les artistes animés (l'appelant efface lui-même les axes)
+        for artist in self.animated:
+            if artist.axes is not None:
+                artist.remove()
+        self.animated = []
+        self.background = None
+        self.base = None
+
+    def commit(self, *artists, replaces=()):
+        # replaces : artistes remplacés (même emplacement) retirés des axes ;
+        # leurs pixels sont recouverts par les nouveaux
+        for artist in replaces:
+            if artist is not None and artist.axes is not None:
+                artist.remove()
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        for artist in artists:
+            if artist is not None:
+                self.ax.draw_artist(artist)
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def snapshot(self):
+        # Fond de départ d'une animation, restauré par discard()
+        self.base = self.background
+
+    def discard(self, *artists):
+        # Retour en arrière dans une animation : retire tous les artistes
+        # intégrés au fond depuis snapshot() et reprend le fond sauvé. Sans
+        # fond sauvé (fenêtre redessinée entre-temps), un redessin complet
+        # le recapture pour les retours suivants
+        for artist in artists:
+            if artist is not None and artist.axes is not None:
+                artist.remove()
+        if self.base is None:
+            self.canvas.draw()
+            self.base = self.background
+        self.background = self.base
+
+    def update(self):
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+    def _draw_animated(self):
+        for artist in self.animated:
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
@@ -5,20 +5,31 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QMessageBox,
 )
-from PyQt5.QtCore import QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import networkx as nx
 import matplotlib.pyplot as plt
-import heapq
 
-import numpy as np
+from algorithmes.Dijkstra import dijkstra
+from algorithmes.trace import DeltaTrace
+from algorithm_worker import BackgroundRun, StepTrace
+from animation_controls import AnimationControls
+from blit_manager import BlitManager
+from playback import LABELS_PER_FRAME, PendingLabels
+from spatial_index import SpatialIndex
+from graph_operations import (
+    NODE_LABEL_LIMIT,
+    NODE_SIZE,
+    WEIGHT_LABEL_LIMIT,
+    draw_edges,
+    draw_nodes,
+)
 
 
 class DijkstraWindow(QMainWindow):
-    def __init__(self, G, pos):
+    def __init__(self, G, pos, cache=None):
         super().__init__()
         self.G = G
         self.pos = pos
+        self.cache = cache
         self.initUI()
 
     def initUI(self):
@@ -38,26 +49,54 @@ class DijkstraWindow(QMainWindow):
         self.ax.axis("off")
         self.canvas = FigureCanvas(self.figure)
         layout.addWidget(self.canvas)
+        self.blit = BlitManager(self.canvas, self.ax)
+
+        self.controls = AnimationControls(
+            self,
+            self.advance,
+            self.seek,
+            finish=self.highlight_shortest_path,
+            settle=self.flush_distances,
+        )
+        layout.addWidget(self.controls)
 
         self.reset_button = QPushButton("Recommencer", self)
         self.reset_button.clicked.connect(self.reset)
         layout.addWidget(self.reset_button)
 
+        self.spatial_index = SpatialIndex(self.G, self.pos)
         self.canvas.mpl_connect("button_press_event", self.on_click_djik)
         self.draw_graph()
 
     def run_dijkstra(self):
         if self.source_node is not None and self.target_node is not None:
-            self.animation_steps = []
-            self.distances, self.previous_nodes = self.dijkstra(
-                self.G, self.source_node, self.visualize_step
-            )
-            self.shortest_path = self.extract_shortest_path(
-                self.previous_nodes, self.source_node, self.target_node
+            self.shortest_path = None
+            self.path_artists = []
+            self.blit.snapshot()
+            self.show_distances([(self.source_node, 0)])
+            key = ("dijkstra", self.source_node, self.target_node)
+            cached_run = self.cache.get(key) if self.cache is not None else None
+            if cached_run is not None:
+                self.trace, _, previous_nodes = cached_run
+                self.shortest_path = self.extract_shortest_path(
+                    previous_nodes, self.source_node, self.target_node
+                )
+                self.controls.show_cached(len(self.trace))
+                return
+            # Trace compacte remplie sur le thread de l'interface, au fil des
+            # étapes reçues ; le calcul travaille sur une copie du graphe
+            # (l'éditeur peut le modifier pendant ce temps)
+            self.trace = DeltaTrace(self.G.nodes(), self.source_node)
+            graph, source, target = self.G.copy(), self.source_node, self.target_node
+            version = self.cache.version if self.cache is not None else None
+            self.controls.run(
+                # La recherche s'arrête dès que la cible est fixée
+                BackgroundRun(
+                    lambda emit: dijkstra(graph, source, target=target, trace=StepTrace(emit))
+                ),
+                self.receive_steps,
+                lambda job: self.run_done(job, key, version),
             )
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self.update_graph_dijkstra)
-            self.timer.start(1000)
         else:
             QMessageBox.warning(
                 self,
@@ -65,131 +104,111 @@ class DijkstraWindow(QMainWindow):
                 "Veuillez sélectionner à la fois les nœuds source et cible avant d'exécuter Dijkstra.",
             )
 
-    def dijkstra(self, graph, source, visualize_step=None):
-        distances = {vertex: float("infinity") for vertex in graph.nodes()}
-        previous_nodes = {vertex: None for vertex in graph.nodes()}
-        distances[source] = 0
-        pq = [(0, source)]
-
-        while pq:
-            current_distance, current_vertex = heapq.heappop(pq)
+    def receive_steps(self, steps):
+        for marker, changes in steps:
+            self.trace.record(marker, changes)
 
-            if visualize_step:
-                visualize_step(graph, current_vertex, distances, previous_nodes)
-
-            if distances[current_vertex] < current_distance:
-                continue
+    def run_done(self, job, key, version):
+        if job.error is not None:
+            QMessageBox.critical(self, "Erreur", str(job.error))
+            return
+        distances, previous_nodes = job.result
+        if self.cache is not None:
+            self.cache.put(key, (self.trace, distances, previous_nodes), version)
+        self.shortest_path = self.extract_shortest_path(
+            previous_nodes, self.source_node, self.target_node
+        )
 
-            for neighbor, data in graph[current_vertex].items():
-                distance = current_distance + data["weight"]
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous_nodes[neighbor] = current_vertex
-                    heapq.heappush(pq, (distance, neighbor))
+    def advance(self, start, end):
+        # Étapes start..end-1 en une image (plusieurs si l'affichage est en
+        # retard) : le marqueur du sommet courant (animé) et les distances
+        # modifiées, dont au plus LABELS_PER_FRAME sont écrites par image ;
+        # le reste vient du fond en cache
+        current_vertex, distances, _ = self.trace.frame(end - 1)
+        self.show_current(current_vertex, distances[current_vertex])
+        if self.all_labels:
+            for step in range(start, end):
+                self.pending.update((node, dist) for node, dist, _ in self.trace.changes(step))
+            self.pending.flush(LABELS_PER_FRAME)
+        self.blit.update()
 
-        return distances, previous_nodes
+    def seek(self, position):
+        # Saut arbitraire : état reconstruit depuis la keyframe la plus
+        # proche de la trace, puis les distances finies réécrites
+        self.blit.discard(*self.distance_labels.values(), *self.path_artists)
+        self.distance_labels = {}
+        self.path_artists = []
+        self.pending.clear()
+        distances = {self.source_node: 0}
+        if position == 0:
+            self.current_marker.set_visible(False)
+            self.current_label.set_visible(False)
+        else:
+            current_vertex, state, _ = self.trace.frame(position - 1)
+            self.show_current(current_vertex, state[current_vertex])
+            if self.all_labels:
+                distances = {node: dist for node, dist in state.items() if dist != float("inf")}
+        self.show_distances(list(distances.items()))
+        self.blit.update()
 
-    def visualize_step(self, graph, current_vertex, distances, previous_nodes):
-        self.animation_steps.append(
-            (graph, current_vertex, distances.copy(), previous_nodes.copy())
-        )
+    def flush_distances(self):
+        # Lecture arrêtée : les distances différées sont écrites
+        self.pending.flush()
+        self.blit.update()
 
-    def update_graph_dijkstra(self):
-        if self.animation_steps:
-            graph, current_vertex, distances, previous_nodes = self.animation_steps.pop(
-                0
-            )
-            self.ax.clear()
-            node_colors = [
-                "green" if node == current_vertex else "lightblue"
-                for node in graph.nodes()
-            ]
-            nx.draw(
-                graph,
-                self.pos,
-                ax=self.ax,
-                with_labels=True,
-                node_color=node_colors,
-                node_size=700,
-                edge_color="gray",
-            )
+    def show_current(self, vertex, dist):
+        # Au-delà de NODE_LABEL_LIMIT sommets, seule la distance du sommet
+        # courant est écrite, dans une étiquette animée
+        x, y = self.pos[vertex]
+        self.current_marker.set_offsets([(x, y)])
+        self.current_marker.set_visible(True)
+        if not self.all_labels:
+            self.current_label.set_position((x, y + 0.05))
+            self.current_label.set_text(f"{dist:>8.1f}")
+            self.current_label.set_visible(True)
 
-            # Dessiner les poids des arêtes
-            for u, v, data in graph.edges(data=True):
-                edge_weight = data["weight"]
-                mid_x, mid_y = (self.pos[u][0] + self.pos[v][0]) / 2, (
-                    self.pos[u][1] + self.pos[v][1]
-                ) / 2
-                self.ax.text(
-                    mid_x,
-                    mid_y,
-                    str(edge_weight),
-                    color="black",
-                    fontsize=9,
-                    ha="center",
-                    va="center",
-                    backgroundcolor="white",
-                )
+    def show_distances(self, distances):
+        # Étiquettes de largeur fixe sur fond opaque : la nouvelle valeur
+        # recouvre entièrement l'ancienne dans le fond en cache
+        labels, replaced = [], []
+        for node, dist in distances:
+            x, y = self.pos[node]
+            label = self.distance_label(x, y + 0.05, f"{dist:>8.1f}")
+            replaced.append(self.distance_labels.get(node))
+            self.distance_labels[node] = label
+            labels.append(label)
+        self.blit.commit(*labels, replaces=replaced)
 
-            for node, dist in distances.items():
-                if dist < float("infinity"):
-                    self.ax.text(
-                        self.pos[node][0],
-                        self.pos[node][1] + 0.05,
-                        f"{dist:.1f}",
-                        color="red",
-                        fontsize=12,
-                        ha="center",
-                        va="center",
-                    )
-
-            self.canvas.draw()
-        else:
-            self.highlight_shortest_path()
+    def distance_label(self, x, y, text):
+        return self.ax.text(
+            x,
+            y,
+            text,
+            color="red",
+            fontsize=12,
+            family="monospace",
+            ha="center",
+            va="center",
+            bbox=dict(facecolor="white", edgecolor="none", pad=1),
+            zorder=4,
+        )
 
     def highlight_shortest_path(self):
-        self.ax.clear()
-        # Dessinez tout le graphe en couleur de base
-        nx.draw(
-            self.G,
-            pos=self.pos,
-            ax=self.ax,
-            with_labels=True,
-            node_color="lightblue",
-            node_size=700,
-            edge_color="gray",
+        if not self.shortest_path:
+            return
+        self.current_marker.set_visible(False)
+        self.current_label.set_visible(False)
+        # Arêtes du chemin le plus court en rouge, avec leurs poids
+        path_edges = [
+            (u, v, self.G[u][v]["weight"])
+            for u, v in zip(self.shortest_path[:-1], self.shortest_path[1:])
+        ]
+        lines, heads, texts = draw_edges(
+            self.ax, self.pos, path_edges, color="red", linewidth=2, label_color="red"
         )
-        # Dessinez les arêtes du chemin le plus court en rouge
-        path_edges = list(zip(self.shortest_path[:-1], self.shortest_path[1:]))
-        nx.draw_networkx_edges(
-            self.G,
-            pos=self.pos,
-            edgelist=path_edges,
-            edge_color="red",
-            width=2,
-            ax=self.ax,
-        )
-        # Afficher les poids sur les arêtes du chemin le plus court
-        for u, v in path_edges:
-            weight = self.G[u][v]["weight"]
-            mid_x, mid_y = (self.pos[u][0] + self.pos[v][0]) / 2, (
-                self.pos[u][1] + self.pos[v][1]
-            ) / 2
-            self.ax.text(
-                mid_x,
-                mid_y,
-                str(weight),
-                color="red",
-                fontsize=10,
-                ha="center",
-                va="center",
-                bbox=dict(
-                    facecolor="white", edgecolor="none", boxstyle="round,pad=0.3"
-                ),
-            )
-
-        self.canvas.draw()
-        self.timer.stop()
+        self.path_artists = [lines, heads, *texts]
+        self.blit.commit(*self.path_artists)
+        self.blit.update()
 
     def extract_shortest_path(self, previous_nodes, source, target):
         path = []
@@ -204,14 +223,9 @@ class DijkstraWindow(QMainWindow):
             return []
 
     def on_click_djik(self, event):
-        x_click, y_click = event.xdata, event.ydata
-        # Find closest node
-        closest_node = min(
-            self.G.nodes,
-            key=lambda node: np.hypot(
-                self.pos[node][0] - x_click, self.pos[node][1] - y_click
-            ),
-        )
+        if event.xdata is None:
+            return
+        closest_node = self.spatial_index.nearest_node(event.xdata, event.ydata)
         if not self.source_node:
             self.source_node = closest_node
             self.highlight_node(self.source_node, "green")
@@ -221,31 +235,56 @@ class DijkstraWindow(QMainWindow):
             self.run_dijkstra()
 
     def highlight_node(self, node, color):
-        nx.draw_networkx_nodes(
-            self.G,
-            self.pos,
-            nodelist=[node],
-            node_color=color,
-            ax=self.ax,
-            node_size=500,
-        )
-        self.canvas.draw()
+        markers, texts = draw_nodes(self.ax, self.pos, [node], [color], size=500)
+        self.blit.commit(markers, *texts)
+        self.blit.update()
+
+    def closeEvent(self, event):
+        self.controls.stop()
+        super().closeEvent(event)
 
     def reset(self):
+        self.controls.stop()
+        self.controls.playback.clear()
         self.source_node = None
         self.target_node = None
-        self.ax.clear()
         self.draw_graph()
-        self.canvas.draw()
 
     def draw_graph(self):
+        # Fond statique : sommets, arêtes et poids, dessinés une seule fois
+        self.blit.reset()
         self.ax.clear()
-        nx.draw(
-            self.G,
+        self.ax.set_xlim([0, 1])
+        self.ax.set_ylim([0, 1])
+        self.ax.axis("off")
+        nodes = list(self.G.nodes())
+        draw_nodes(
+            self.ax,
             self.pos,
-            ax=self.ax,
-            with_labels=True,
-            node_color="lightblue",
-            edge_color="gray",
+            nodes,
+            ["lightblue"] * len(nodes),
+            labels=len(nodes) <= NODE_LABEL_LIMIT,
+            label_color="black",
+        )
+        edges = list(self.G.edges(data="weight", default=1))
+        draw_edges(
+            self.ax,
+            self.pos,
+            edges,
+            color="gray",
+            labels=len(edges) <= WEIGHT_LABEL_LIMIT,
+            label_color="black",
+        )
+        # Sommet courant de l'animation : un anneau, le nom reste lisible
+        self.current_marker = self.blit.add(
+            self.ax.scatter(
+                [], [], s=NODE_SIZE, facecolors="none", edgecolors="green", linewidths=3, zorder=2
+            )
         )
-        self.canvas.draw()
+        self.current_marker.set_visible(False)
+        self.current_label = self.blit.add(self.distance_label(0, 0, ""))
+        self.current_label.set_visible(False)
+        self.all_labels = len(self.pos) <= NODE_LABEL_LIMIT
+        self.distance_labels = {}
+        self.pending = PendingLabels(self.show_distances)
+        self.canvas.draw_idle()
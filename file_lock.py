@@ -0,0 +1,52 @@
+import os
+
+# Verrou consultatif inter-processus sur un fichier (fcntl.flock sous POSIX,
+# msvcrt.locking sous Windows). Chaque instance ouvre son propre descripteur :
+# deux threads du même processus s'excluent donc aussi
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            # LK_LOCK réessaie pendant 10 s ; boucler pour attendre sans limite
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._file.close()
+        self._file = None
+
+
+def temp_path(path):
+    # Fichier temporaire unique dans le même dossier (os.replace atomique) :
+    # deux écrivains simultanés n'utilisent jamais le même
+    import tempfile
+
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    os.close(fd)
+    return tmp
@@ -0,0 +1,179 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+# Format binaire d'un graphe sauvegardé :
+#   MAGIC | version (uint32) | taille de l'en-tête (uint32) | en-tête JSON |
+#   tableaux NumPy bruts, chacun aligné sur ALIGNMENT octets
+# L'en-tête décrit chaque tableau (dtype, forme, position) pour pouvoir les
+# projeter en mémoire (np.memmap) sans copie au chargement
+MAGIC = b"GTGRAPH\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def graph_to_arrays(G, pos, node_counter):
+    nodes = list(G.nodes())
+    edges = list(G.edges(data="weight", default=1))
+    return _arrays(nodes, edges, pos, node_counter)
+
+
+def legacy_to_arrays(graph_data):
+    # Anciens formats pickle : {"G", "pos"} (graphe networkx), ou listes de
+    # sommets, d'arcs (u, v, data) et dict de positions
+    if "G" in graph_data:
+        G = graph_data["G"]
+        return graph_to_arrays(G, graph_data["pos"], max(G.nodes(), default=0) + 1)
+    nodes = list(graph_data["nodes"])
+    edges = [(u, v, d.get("weight", 1)) for u, v, d in graph_data["edges"]]
+    node_counter = graph_data.get("node_counter", max(nodes, default=0) + 1)
+    return _arrays(nodes, edges, graph_data["positions"], node_counter)
+
+
+def fill_graph(G, arrays):
+    # Insertion en bloc dans G ; renvoie le dict de positions
+    node_ids = arrays["nodes"]
+    nodes = node_ids.tolist()
+    src = np.repeat(np.arange(len(nodes)), np.diff(arrays["indptr"]))
+    G.add_nodes_from(nodes)
+    G.add_weighted_edges_from(
+        zip(
+            node_ids[src].tolist(),
+            node_ids[arrays["indices"]].tolist(),
+            arrays["weights"].tolist(),
+        )
+    )
+    return {
+        node: (x, y)
+        for node, (x, y) in zip(nodes, arrays["positions"].tolist())
+        if x == x  # NaN : sommet sans position
+    }
+
+
+def _arrays(nodes, edges, pos, node_counter):
+    # Arcs rangés par sommet de départ (comme un CSR) : seuls indptr et les
+    # extrémités d'arrivée sont stockés, dans le plus petit type entier possible
+    index = {node: i for i, node in enumerate(nodes)}
+    src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=len(edges))
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(nodes)), out=indptr[1:])
+    positions = np.full((len(nodes), 2), np.nan)
+    for node, (x, y) in pos.items():
+        if node in index:
+            positions[index[node]] = (x, y)
+    return {
+        "nodes": _node_array(nodes),
+        "indptr": indptr,
+        "indices": dst[order].astype(np.min_scalar_type(max(len(nodes) - 1, 0))),
+        "weights": _weight_array([w for _, _, w in edges])[order],
+        "positions": positions,
+        "node_counter": node_counter,
+    }
+
+
+def write_graph_file(path, arrays):
+    names = [name for name, value in arrays.items() if isinstance(value, np.ndarray)]
+    header = {
+        "node_counter": arrays["node_counter"],
+        # Dernière entrée du journal d'édition déjà incluse dans ce fichier
+        "journal_seq": arrays.get("journal_seq", 0),
+        "arrays": {},
+    }
+    # La taille de l'en-tête détermine la position des tableaux : recalculer
+    # jusqu'à ce que l'en-tête tienne avant le premier tableau
+    data_start = 0
+    while True:
+        offset = data_start
+        for name in names:
+            array = arrays[name]
+            header["arrays"][name] = {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offset,
+            }
+            offset = _align(offset + array.nbytes)
+        encoded = json.dumps(header).encode()
+        needed = _align(_PREAMBLE.size + len(encoded))
+        if needed <= data_start:
+            break
+        data_start = needed
+
+    with open(path, "wb") as file:
+        file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+        file.write(encoded)
+        for name in names:
+            file.seek(header["arrays"][name]["offset"])
+            file.write(np.ascontiguousarray(arrays[name]).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def read_graph_header(path):
+    # En-tête seul : nombres de sommets et d'arcs sans lire les tableaux
+    with open(path, "rb") as file:
+        header, _ = _read_header(file, path)
+    arrays = header["arrays"]
+    header["node_count"] = arrays["nodes"]["shape"][0]
+    header["edge_count"] = arrays["indices"]["shape"][0]
+    return header
+
+
+def read_graph_file(path, mmap=True):
+    with open(path, "rb") as file:
+        header, header_size = _read_header(file, path)
+        if not mmap:
+            data = np.frombuffer(file.read(), dtype=np.uint8)
+            base = _PREAMBLE.size + header_size
+    if mmap:
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        base = 0
+
+    arrays = {
+        "node_counter": header["node_counter"],
+        "journal_seq": header.get("journal_seq", 0),
+    }
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = spec["offset"] - base
+        arrays[name] = data[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+    return arrays
+
+
+def _read_header(file, path):
+    magic, version, header_size = _PREAMBLE.unpack(file.read(_PREAMBLE.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} n'est pas un fichier de graphe.")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Version de format {version} non prise en charge.")
+    return json.loads(file.read(header_size)), header_size
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _node_array(nodes):
+    if all(isinstance(node, (int, np.integer)) for node in nodes):
+        array = np.array(nodes, dtype=np.int64)
+        if array.size == 0:
+            return array
+        return array.astype(np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max())))
+    if all(isinstance(node, str) for node in nodes):
+        return np.array(nodes, dtype=str)
+    raise ValueError("Les sommets doivent être tous des entiers ou tous des chaînes.")
+
+
+def _weight_array(weights):
+    array = np.array(weights)
+    if array.size == 0 or array.dtype.kind not in "iuf":
+        return np.array(weights, dtype=np.float64)
+    if array.dtype.kind == "f":
+        return array.astype(np.float64)
+    # Poids entiers : le plus petit type signé qui contient toutes les valeurs
+    return array.astype(np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(-array.max() - 1)))
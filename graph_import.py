@@ -0,0 +1,133 @@
+import os
+import xml.etree.ElementTree as ET
+
+import networkx as nx
+
+from background_job import BackgroundJob
+
+# Import de gros graphes (liste d'arcs, CSV, GraphML) : le fichier est lu
+# par morceaux sur un thread de fond ; les morceaux passent par une file
+# bornée, donc la mémoire utilisée pendant la lecture ne dépend pas de la
+# taille du fichier
+CHUNK_SIZE = 50000
+MAX_PENDING_CHUNKS = 4
+HEADER_NAMES = {"source", "target", "src", "dst", "from", "to", "weight", "poids"}
+
+
+def parse_node(token):
+    try:
+        return int(token)
+    except ValueError:
+        return token
+
+
+def uniform_node_ids(G):
+    # parse_node donne un entier quand il le peut : un fichier mêlant
+    # identifiants numériques et textuels donnerait des sommets des deux
+    # types, que le format .gtg n'enregistre pas. Les entiers deviennent
+    # alors des chaînes (sans collision : "5" aurait été lu comme 5)
+    numeric = [node for node in G if not isinstance(node, str)]
+    if numeric and len(numeric) < G.number_of_nodes():
+        nx.relabel_nodes(G, {node: str(node) for node in numeric}, copy=False)
+
+
+def parse_weight(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def iter_edge_list(file, delimiter=None):
+    # Lignes "u v [poids]" (ou "u,v,poids" en CSV) ; les lignes vides et les
+    # commentaires (#, %) sont ignorés, tout comme une ligne d'en-tête CSV
+    first = True
+    for raw in file:
+        line = raw.decode("utf-8").strip()
+        if not line or line[0] in "#%":
+            continue
+        fields = [field.strip() for field in line.split(delimiter)]
+        if first:
+            first = False
+            if HEADER_NAMES.intersection(field.lower() for field in fields):
+                continue
+        if len(fields) < 2:
+            raise ValueError(f"Ligne invalide : {line!r}")
+        weight = parse_weight(fields[2]) if len(fields) > 2 and fields[2] else 1
+        yield parse_node(fields[0]), parse_node(fields[1]), weight
+
+
+def iter_graphml(file):
+    # Lecture incrémentale (iterparse) : chaque sommet ou arc lu est détaché
+    # de son parent (<graph>), que iterparse garderait sinon en entier.
+    # Donne (sommet, None, None) pour un sommet et (u, v, poids) pour un arc
+    weight_keys = set()
+    parents = []  # Éléments ouverts
+    for event, element in ET.iterparse(file, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+        parents.pop()
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "key":
+            # Lues avant les sommets et les arcs : gardées
+            if element.get("attr.name") == "weight":
+                weight_keys.add(element.get("id"))
+        elif tag == "node":
+            yield parse_node(element.get("id")), None, None
+            del parents[-1][:]
+        elif tag == "edge":
+            weight = 1
+            for data in element:
+                if data.get("key") in weight_keys and data.text:
+                    weight = parse_weight(data.text.strip())
+            yield parse_node(element.get("source")), parse_node(element.get("target")), weight
+            del parents[-1][:]
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    # Donne (sommets, arcs, octets lus) par morceaux de chunk_size éléments
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "rb") as file:
+        if extension == ".graphml":
+            items = iter_graphml(file)
+        else:
+            items = iter_edge_list(file, "," if extension == ".csv" else None)
+        nodes, edges = [], []
+        for u, v, weight in items:
+            if v is None:
+                nodes.append(u)
+            else:
+                edges.append((u, v, weight))
+            if len(nodes) + len(edges) >= chunk_size:
+                yield nodes, edges, file.tell()
+                nodes, edges = [], []
+        if nodes or edges:
+            yield nodes, edges, file.tell()
+
+
+class BackgroundImport(BackgroundJob):
+    # Lit un fichier sur un thread de fond ; le thread de l'interface récupère
+    # les morceaux avec take_chunks() et les insère lui-même dans le graphe
+    def __init__(self, path, chunk_size=CHUNK_SIZE, max_pending=MAX_PENDING_CHUNKS):
+        super().__init__(max_pending)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+
+    @property
+    def progress(self):
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    def work(self):
+        # Fichier illisible ou mal formé : l'erreur est rapportée par BackgroundJob
+        for chunk in read_chunks(self.path, self.chunk_size):
+            self.put(chunk)
+
+    def take_chunks(self):
+        # Morceaux disponibles (sans attendre) : liste de (sommets, arcs)
+        chunks = []
+        for nodes, edges, self.bytes_read in self.available():
+            chunks.append((nodes, edges))
+        return chunks
@@ -0,0 +1,219 @@
+import math
+
+import networkx as nx
+import numpy as np
+
+# Disposition automatique des sommets, en coordonnées [0, 1]² comme celles
+# de l'éditeur :
+# - force_layout : modèle de forces (Fruchterman-Reingold) vectorisé ;
+# - layered_layout : couches de haut en bas pour un graphe orienté sans
+#   circuit (façon Sugiyama) ;
+# - auto_layout : la seconde pour un DAG, la première sinon.
+# callback(itération) est appelé à chaque itération (progression,
+# annulation par algorithm_worker.BackgroundRun)
+ITERATIONS = 100
+SWEEPS = 8  # Passes de barycentres (alternativement vers le bas et vers le haut)
+MARGIN = 0.05
+INITIAL_TEMPERATURE = 0.1  # Déplacement maximal d'un sommet à la première itération
+# Attraction des composantes connexes vers le centre, relative au rayon
+# courant du dessin : sans elle, sommets isolés et petites composantes sont
+# repoussés au loin et tassent le reste une fois la vue recadrée
+GRAVITY = 1.0
+EXACT_REPULSION_LIMIT = 1000  # Au-delà, répulsion approchée sur une grille
+GRID_MAX = 128  # Cases par côté de la grille de répulsion
+MAX_CELL_PAIRS = 4  # Voisins d'une même case repoussés exactement
+
+
+def auto_layout(G, seed=None, callback=None):
+    if G.is_directed() and G.number_of_edges() and nx.is_directed_acyclic_graph(G):
+        return layered_layout(G, callback=callback)
+    return force_layout(G, seed=seed, callback=callback)
+
+
+def force_layout(G, pos=None, iterations=ITERATIONS, seed=None, callback=None):
+    # Chaque arête attire ses extrémités (d² / k), chaque paire de sommets se
+    # repousse (k² / d), k étant la distance idéale pour n sommets dans le
+    # carré unité. Les déplacements sont bornés par une température qui
+    # décroît à chaque itération. pos : positions de départ (optionnelles)
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n == 0:
+        return {}
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0.0, 1.0, (n, 2))
+    if pos:
+        for i, node in enumerate(nodes):
+            if node in pos:
+                xy[i] = pos[node]
+    if n == 1:
+        return {nodes[0]: (0.5, 0.5)}
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array(
+        [(index[u], index[v]) for u, v in G.edges() if u != v], dtype=np.int64
+    ).reshape(-1, 2)
+    src, dst = np.ascontiguousarray(edges[:, 0]), np.ascontiguousarray(edges[:, 1])
+    component = _components(n, src, dst)
+    component_size = np.bincount(component)
+    k = math.sqrt(1.0 / n)
+    repulsion = _exact_repulsion if n <= EXACT_REPULSION_LIMIT else GridRepulsion(n)
+    for iteration in range(iterations):
+        force = repulsion(xy, k)
+        # Chaque composante est tirée d'un bloc (par son centre de gravité) :
+        # sa forme n'est pas déformée
+        offset = xy - (xy[:, 0].mean(), xy[:, 1].mean())
+        radius2 = max(np.vdot(offset, offset) / n, 1e-12)
+        for axis in (0, 1):
+            center = np.bincount(component, offset[:, axis]) / component_size
+            force[:, axis] -= center[component] * (GRAVITY / radius2)
+        if len(src):
+            delta = np.take(xy, dst, axis=0) - np.take(xy, src, axis=0)
+            pull = delta * (_lengths(delta) / k)[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(src, pull[:, axis], n)
+                force[:, axis] -= np.bincount(dst, pull[:, axis], n)
+        temperature = INITIAL_TEMPERATURE * (1 - iteration / iterations)
+        length = np.maximum(_lengths(force), 1e-12)
+        xy += force * (np.minimum(length, temperature) / length)[:, None]
+        if callback is not None:
+            callback(iteration)
+    return _normalize(nodes, xy)
+
+
+def _components(n, src, dst):
+    # Numéro de composante connexe de chaque sommet (arcs pris sans
+    # orientation), par propagation vectorisée du plus petit numéro
+    label = np.arange(n)
+    while True:
+        low = np.minimum(label[src], label[dst])
+        update = label.copy()
+        np.minimum.at(update, src, low)
+        np.minimum.at(update, dst, low)
+        update = update[update]  # Saut de pointeurs : convergence rapide
+        if np.array_equal(update, label):
+            return np.unique(label, return_inverse=True)[1]
+        label = update
+
+
+def _lengths(vectors):
+    # Normes des lignes d'un tableau (m, 2)
+    return np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+
+
+def _bounds(xy):
+    # Coins de la boîte englobante, colonne par colonne (les réductions
+    # selon l'axe 0 d'un tableau (n, 2) sont lentes)
+    x, y = xy[:, 0], xy[:, 1]
+    return np.array((x.min(), y.min())), np.array((x.max(), y.max()))
+
+
+def _exact_repulsion(xy, k):
+    # Toutes les paires : n² distances, pour les petits graphes
+    dx = xy[:, 0, None] - xy[None, :, 0]
+    dy = xy[:, 1, None] - xy[None, :, 1]
+    distance2 = np.maximum(dx * dx + dy * dy, 1e-9)
+    np.fill_diagonal(distance2, np.inf)
+    scale = k * k / distance2
+    return np.column_stack(((dx * scale).sum(axis=1), (dy * scale).sum(axis=1)))
+
+
+class GridRepulsion:
+    # Répulsion approchée en O(n + g² log g) : les sommets sont comptés sur
+    # une grille g × g couvrant leur boîte englobante, et le champ de
+    # répulsion de toute la grille est une convolution (FFT) de ces comptes
+    # par le noyau d / |d|². Chaque sommet reçoit le champ de sa case ; les
+    # sommets d'une même case (que la grille ne sépare pas) se repoussent
+    # exactement
+    def __init__(self, n):
+        self.size = min(GRID_MAX, max(16, 2 * math.ceil(math.sqrt(n))))
+        size = self.size
+        # Noyau en unités de cases, sur une grille doublée (convolution sans
+        # repliement) ; nul au centre
+        offsets = np.fft.fftfreq(2 * size, 1.0 / (2 * size))
+        dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+        distance2 = dx * dx + dy * dy
+        distance2[0, 0] = np.inf
+        self.kernels = [np.fft.rfft2(dx / distance2), np.fft.rfft2(dy / distance2)]
+
+    def __call__(self, xy, k):
+        size = self.size
+        low, high = _bounds(xy)
+        cell = max((high - low).max() / size, 1e-9)
+        cells = np.minimum(((xy - low) / cell).astype(np.int64), size - 1)
+        flat = cells[:, 0] * size + cells[:, 1]
+        counts = np.zeros((2 * size, 2 * size))
+        counts[:size, :size] = np.bincount(flat, minlength=size * size).reshape(size, size)
+        spectrum = np.fft.rfft2(counts)
+        padded = cells[:, 0] * (2 * size) + cells[:, 1]  # Case dans la grille doublée
+        force = np.empty_like(xy)
+        for axis, kernel in enumerate(self.kernels):
+            field = np.fft.irfft2(spectrum * kernel, counts.shape)
+            force[:, axis] = field.ravel()[padded]
+        force *= k * k / cell
+        # Même case : paires de sommets voisins une fois triés par case
+        order = np.argsort(flat)
+        sorted_cells = flat[order]
+        for shift in range(1, MAX_CELL_PAIRS + 1):
+            same = np.flatnonzero(sorted_cells[shift:] == sorted_cells[:-shift])
+            if not len(same):
+                break
+            a, b = order[same], order[same + shift]
+            delta = np.take(xy, a, axis=0) - np.take(xy, b, axis=0)
+            push = delta * (k * k / np.maximum(_lengths(delta) ** 2, 1e-12))[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(a, push[:, axis], len(xy))
+                force[:, axis] -= np.bincount(b, push[:, axis], len(xy))
+        return force
+
+
+def layered_layout(G, sweeps=SWEEPS, callback=None):
+    # Disposition en couches d'un graphe orienté sans circuit :
+    # 1. couche d'un sommet = plus long chemin depuis une source ;
+    # 2. ordre dans chaque couche : barycentre des voisins de la couche
+    #    précédente (passes vers le bas) ou suivante (vers le haut), pour
+    #    limiter les croisements ; les arcs longs n'ont pas de sommets fictifs ;
+    # 3. sommets espacés régulièrement dans leur couche, couches de haut en bas
+    nodes = list(nx.topological_sort(G))
+    n = len(nodes)
+    if n == 0:
+        return {}
+    index = {node: i for i, node in enumerate(nodes)}
+    layer = [0] * n
+    for i, node in enumerate(nodes):
+        for successor in G.successors(node):
+            j = index[successor]
+            if layer[j] <= layer[i]:
+                layer[j] = layer[i] + 1
+    layer = np.array(layer, dtype=np.int64)
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    sizes = np.bincount(layer)
+    x = _spread(layer, np.arange(n, dtype=float), sizes)
+    for sweep in range(sweeps):
+        # Passes paires : barycentre des prédécesseurs ; impaires : des successeurs
+        moved, neighbor = (edges[:, 1], edges[:, 0]) if sweep % 2 == 0 else (edges[:, 0], edges[:, 1])
+        degree = np.bincount(moved, minlength=n)
+        total = np.bincount(moved, x[neighbor], minlength=n)
+        barycenter = np.where(degree > 0, total / np.maximum(degree, 1), x)
+        x = _spread(layer, barycenter, sizes)
+        if callback is not None:
+            callback(sweep)
+    depth = max(int(layer.max()), 1)
+    y = 1.0 - layer / depth
+    xy = np.column_stack((x, y)) * (1 - 2 * MARGIN) + MARGIN
+    return dict(zip(nodes, map(tuple, xy.tolist())))
+
+
+def _spread(layer, key, sizes):
+    # Rang de chaque sommet dans sa couche (selon key), ramené dans ]0, 1[
+    order = np.lexsort((key, layer))
+    starts = np.cumsum(sizes) - sizes
+    rank = np.empty(len(layer), dtype=np.int64)
+    rank[order] = np.arange(len(layer)) - starts[layer[order]]
+    return (rank + 1) / (sizes[layer] + 1)
+
+
+def _normalize(nodes, xy):
+    # Boîte englobante ramenée dans [MARGIN, 1 - MARGIN]², proportions gardées
+    low, high = _bounds(xy)
+    extent = max((high - low).max(), 1e-12)
+    xy = (xy - low) / extent * (1 - 2 * MARGIN) + MARGIN
+    return dict(zip(nodes, map(tuple, xy.tolist())))
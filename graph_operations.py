@@ -1,55 +1,287 @@
-import networkx as nx
-from matplotlib.patches import FancyArrowPatch
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+
+# Rendu groupé : toutes les arêtes forment une seule LineCollection (arcs
+# courbes échantillonnés), toutes les pointes de flèche une seule
+# PolyCollection et tous les sommets un seul scatter ; un redessin ne
+# demande qu'un draw_idle() au lieu d'un canvas.draw() par arête
+NODE_SIZE = 700
+EDGE_RAD = 0.1  # Courbure des arcs (comme connectionstyle "arc3,rad=0.1")
+SHRINK = 15  # Recul des extrémités, en points (rayon d'un sommet)
+ARROW_SIZE = 20  # Taille des pointes de flèche, en points
+LOOP_RADIUS = 0.05
+CURVE_POINTS = 12
+LOOP_POINTS = 32
+# Au-delà, les poids (ou les noms des sommets) ne sont plus écrits : un
+# texte par arête ou par sommet coûte plus cher que tout le reste du rendu
+WEIGHT_LABEL_LIMIT = 500
+NODE_LABEL_LIMIT = 300
+# Niveau de détail (draw_scene) : seul ce qui est dans la vue (plus une
+# marge, pour qu'un déplacement ne découvre pas de vide) est dessiné ; les
+# sommets rapetissent quand la vue en contient beaucoup
+VIEW_MARGIN = 0.25
+MIN_NODE_SIZE = 4
+LABEL_MIN_SIZE = 200  # En deçà (points²), un sommet est trop petit pour son nom
+MIN_ARROW_SIZE = 4
+CURVE_EDGE_LIMIT = 5000  # Au-delà, arêtes droites sans pointe
+
 
 def redrawGraph(ax, G, pos, stable_set, canvas):
-    ax.clear()
-    ax.set_xlim([0, 1])
-    ax.set_ylim([0, 1])
-    ax.axis("off")
-    nx.draw_networkx_nodes(
-        G,
-        pos,
-        ax=ax,
-        node_size=700,
-        node_color=["red" if node in stable_set else "skyblue" for node in G.nodes()],
-        alpha=0.9,
-    )
-    nx.draw_networkx_labels(G, pos, ax=ax, font_size=10, font_color="white")
-    for node1, node2, data in G.edges(data=True):
-        draw_edge(ax, pos, node1, node2, data.get("weight", 1), canvas)
-    canvas.draw()
+    # Avec une GraphView (zoom et déplacement), la vue garde la scène pour
+    # les redessins suivants
+    view = getattr(ax, "graph_view", None)
+    if view is not None:
+        view.show(G, pos, stable_set)
+        return
+    draw_scene(ax, GraphScene(G, pos, stable_set))
+    canvas.draw_idle()
+
+def new_node_id(G, counter):
+    # Identifiant d'un nouveau sommet, du même type que ceux du graphe
+    # (chaînes pour un graphe importé à identifiants textuels) et absent du
+    # graphe ; renvoie (identifiant, compteur suivant)
+    text = isinstance(next(iter(G), None), str)
+    while True:
+        node_id = str(counter) if text else counter
+        counter += 1
+        if node_id not in G:
+            return node_id, counter
 
 def addNode(G, pos, x, y, ax, canvas):
     if hasattr(G, 'graph_designer') and hasattr(G.graph_designer, 'node_counter'):
-        node_id = G.graph_designer.node_counter  # Use node_counter instead of len(G.nodes)
+        # Use node_counter instead of len(G.nodes)
+        node_id, G.graph_designer.node_counter = new_node_id(G, G.graph_designer.node_counter)
         pos[node_id] = (x, y)
         G.add_node(node_id)
-        G.graph_designer.node_counter += 1  # Increment the node counter
+        G.graph_designer.spatial_index.add_node(node_id, (x, y))
         redrawGraph(ax, G, pos, [], canvas)
+        return node_id
 
 def draw_edge(ax, pos, node1, node2, weight, canvas):
-    if node1 != node2:
-        x1, y1 = pos[node1]
-        x2, y2 = pos[node2]
-        rad = 0.1  # Réglage de la courbure pour un rendu esthétique
-
-        # Création de la flèche
-        arrow = FancyArrowPatch(
-            (x1, y1), (x2, y2),
-            arrowstyle="-|>",
-            color="black",
-            lw=1,
-            connectionstyle=f"arc3,rad={rad}",
-            shrinkA=15,
-            shrinkB=15,
-            mutation_scale=20
+    view = getattr(ax, "graph_view", None)
+    draw_edges(ax, pos, [(node1, node2, weight)], scale=view.scale if view else 1.0)
+    if view is not None:
+        view.invalidate()
+    canvas.draw_idle()
+
+
+class GraphScene:
+    # Tableaux d'un graphe pour draw_scene, construits une fois par
+    # modification : zoomer ou déplacer la vue ne reparcourt pas G
+    def __init__(self, G, pos, stable_set=()):
+        self.nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(self.nodes)}
+        self.xy = np.array([pos[node] for node in self.nodes], dtype=float).reshape(-1, 2)
+        stable = set(stable_set)
+        self.stable = np.array([node in stable for node in self.nodes], dtype=bool)
+        self.edges = list(G.edges(data="weight", default=1))
+        self.src = np.array([index[u] for u, _, _ in self.edges], dtype=np.int64)
+        self.dst = np.array([index[v] for _, v, _ in self.edges], dtype=np.int64)
+
+
+def draw_scene(ax, scene):
+    # Dessine la partie visible de la scène dans les limites actuelles des
+    # axes ; renvoie l'échelle des sommets (1 : taille normale)
+    xlim, ylim = ax.get_xlim(), ax.get_ylim()
+    ax.clear()
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    ax.axis("off")
+    (x0, x1), (y0, y1) = sorted(xlim), sorted(ylim)
+    view_low, view_high = np.array([x0, y0]), np.array([x1, y1])
+    margin = (view_high - view_low) * VIEW_MARGIN
+    low, high = view_low - margin, view_high + margin
+
+    xy = scene.xy
+    shown = np.flatnonzero(((xy >= low) & (xy <= high)).all(axis=1))
+    # Noms et poids : seulement dans la vue elle-même (pas dans la marge)
+    labeled = shown[((xy[shown] >= view_low) & (xy[shown] <= view_high)).all(axis=1)]
+    in_view = len(labeled)
+    src, dst = xy[scene.src], xy[scene.dst]
+    edge_shown = np.flatnonzero(
+        ((np.minimum(src, dst) <= high) & (np.maximum(src, dst) >= low)).all(axis=1)
+    )
+
+    # Taille des sommets selon leur espacement moyen à l'écran
+    points = 72 / ax.figure.dpi
+    area = ax.bbox.width * points * ax.bbox.height * points
+    size = NODE_SIZE
+    if in_view:
+        size = float(np.clip((0.5 * np.sqrt(area / in_view)) ** 2, MIN_NODE_SIZE, NODE_SIZE))
+    scale = np.sqrt(size / NODE_SIZE)
+
+    node_labels = in_view <= NODE_LABEL_LIMIT and size >= LABEL_MIN_SIZE
+    curved = len(edge_shown) <= CURVE_EDGE_LIMIT
+    weight_labels = curved and len(edge_shown) <= WEIGHT_LABEL_LIMIT and node_labels
+    if len(shown):
+        ax.scatter(
+            xy[shown, 0],
+            xy[shown, 1],
+            s=size,
+            c=np.where(scene.stable[shown], "red", "skyblue"),
+            alpha=0.9,
+            edgecolors="none",
+            zorder=2,
+        )
+        if node_labels:
+            for i, (x, y) in zip(labeled.tolist(), xy[labeled].tolist()):
+                ax.text(x, y, str(scene.nodes[i]), fontsize=10, color="white", ha="center", va="center", zorder=3)
+    if len(edge_shown):
+        s, d = src[edge_shown], dst[edge_shown]
+        if curved:
+            is_loop = scene.src[edge_shown] == scene.dst[edge_shown]
+            curves, arrows, label_xy = _geometry(ax, s, d, is_loop, EDGE_RAD, scale)
+            ax.add_collection(LineCollection(curves, colors="black", linewidths=1, zorder=1), autolim=False)
+            if ARROW_SIZE * scale >= MIN_ARROW_SIZE:
+                ax.add_collection(
+                    PolyCollection(arrows, facecolors="black", edgecolors="black", linewidths=1, zorder=1),
+                    autolim=False,
+                )
+            if weight_labels:
+                inside = ((label_xy >= view_low) & (label_xy <= view_high)).all(axis=1)
+                for i, (x, y) in zip(edge_shown[inside].tolist(), label_xy[inside].tolist()):
+                    ax.text(
+                        x, y, str(scene.edges[i][2]), color="darkblue", fontsize=7, ha="center",
+                        va="center", backgroundcolor="white", zorder=3,
+                    )
+        else:
+            # Vue d'ensemble : segments droits, fins et sans pointe, en une
+            # seule ligne coupée par des NaN (bien moins coûteux qu'une
+            # LineCollection d'autant de segments)
+            segments = np.stack((s, d, np.full_like(s, np.nan)), axis=1).reshape(-1, 2)
+            ax.plot(
+                segments[:, 0], segments[:, 1], color="black", linewidth=0.5, alpha=0.3,
+                zorder=1, scalex=False, scaley=False,
+            )
+    if len(shown) and not (node_labels and (weight_labels or not len(edge_shown))):
+        # Noms et poids omis : un seul résumé à la place
+        ax.text(
+            0.01, 0.01,
+            f"{in_view} sommets visibles, {len(edge_shown)} arcs dessinés "
+            "(zoomer pour afficher les noms et les poids)",
+            transform=ax.transAxes, fontsize=8, color="gray", zorder=4,
         )
-        ax.add_patch(arrow)
+    return scale
+
+
+def draw_nodes(ax, pos, nodes, colors, labels=True, size=NODE_SIZE, label_color="white"):
+    # Un seul scatter pour tous les sommets ; renvoie (scatter, textes)
+    if not nodes:
+        return None, []
+    xy = np.array([pos[node] for node in nodes], dtype=float)
+    markers = ax.scatter(
+        xy[:, 0], xy[:, 1], s=size, c=colors, alpha=0.9, edgecolors="none", zorder=2
+    )
+    texts = []
+    if labels:
+        texts = [
+            ax.text(x, y, str(node), fontsize=10, color=label_color, ha="center", va="center", zorder=3)
+            for node, (x, y) in zip(nodes, xy.tolist())
+        ]
+    return markers, texts
+
+
+def draw_edges(
+    ax,
+    pos,
+    edges,
+    color="black",
+    linewidth=1,
+    labels=True,
+    directed=True,
+    label_color="darkblue",
+    scale=1.0,
+):
+    # edges : (u, v, poids). Non orienté : segments droits sans pointe.
+    # scale : échelle des sommets (reculs et pointes proportionnels).
+    # Renvoie (lignes, pointes, textes) pour pouvoir les modifier ensuite
+    if not edges:
+        return None, None, []
+    curves, arrows, label_xy = edge_geometry(
+        ax, pos, [(u, v) for u, v, _ in edges], EDGE_RAD if directed else 0, scale
+    )
+    lines = LineCollection(curves, colors=color, linewidths=linewidth, zorder=1)
+    ax.add_collection(lines, autolim=False)
+    heads = None
+    if directed:
+        heads = PolyCollection(arrows, facecolors=color, edgecolors=color, linewidths=linewidth, zorder=1)
+        ax.add_collection(heads, autolim=False)
+    texts = []
+    if labels:
+        texts = [
+            ax.text(
+                x, y, str(weight), color=label_color, fontsize=7, ha="center", va="center",
+                backgroundcolor="white", zorder=3,
+            )
+            for (x, y), (_, _, weight) in zip(label_xy.tolist(), edges)
+        ]
+    return lines, heads, texts
+
+
+def fit_view(ax, pos, margin=0.1):
+    # Cadre les axes sur les positions (dispositions hors de [0, 1]²)
+    if not pos:
+        return
+    xy = np.array(list(pos.values()), dtype=float)
+    low, high = xy.min(axis=0), xy.max(axis=0)
+    pad = np.maximum((high - low) * margin, 0.1)
+    ax.set_xlim(low[0] - pad[0], high[0] + pad[0])
+    ax.set_ylim(low[1] - pad[1], high[1] + pad[1])
+
+
+def edge_geometry(ax, pos, edges, rad=EDGE_RAD, scale=1.0):
+    is_loop = np.array([u == v for u, v in edges], dtype=bool)
+    src = np.array([pos[u] for u, _ in edges], dtype=float).reshape(-1, 2)
+    dst = np.array([pos[v] for _, v in edges], dtype=float).reshape(-1, 2)
+    return _geometry(ax, src, dst, is_loop, rad, scale)
+
+
+def _geometry(ax, src, dst, is_loop, rad, scale):
+    # Géométrie de toutes les arêtes en une passe NumPy. Les reculs et les
+    # pointes sont calculés en pixels (taille fixe à l'écran, multipliée par
+    # scale), puis ramenés en coordonnées de données. Renvoie (courbes,
+    # triangles des pointes, positions des poids) ; les boucles sont des
+    # cercles sans pointe
+    curves = [None] * len(src)
+    label_xy = np.empty((len(src), 2))
+
+    to_pixels = ax.transData.transform
+    to_data = ax.transData.inverted().transform
+    points = ax.figure.dpi / 72 * scale
+
+    arcs = ~is_loop
+    p0, p2 = to_pixels(src[arcs]), to_pixels(dst[arcs])
+    d = p2 - p0
+    control = (p0 + p2) / 2 + rad * np.column_stack((d[:, 1], -d[:, 0]))
+    # Poids au milieu de l'arc complet (avant recul)
+    label_xy[arcs] = to_data((p0 + p2) / 2 + rad / 2 * np.column_stack((d[:, 1], -d[:, 0])))
+    start_dir = _unit(control - p0)
+    end_dir = _unit(control - p2)
+    p0 = p0 + SHRINK * points * start_dir
+    p2 = p2 + SHRINK * points * end_dir
+    t = np.linspace(0, 1, CURVE_POINTS)[None, :, None]
+    bezier = (1 - t) ** 2 * p0[:, None] + 2 * (1 - t) * t * control[:, None] + t**2 * p2[:, None]
+    bezier = to_data(bezier.reshape(-1, 2)).reshape(bezier.shape)
+    for i, curve in zip(np.flatnonzero(arcs).tolist(), bezier):
+        curves[i] = curve
+
+    # Pointe : triangle dont le sommet touche le recul côté arrivée
+    length, half_width = 0.4 * ARROW_SIZE * points, 0.2 * ARROW_SIZE * points
+    normal = np.column_stack((-end_dir[:, 1], end_dir[:, 0]))
+    base = p2 + length * end_dir
+    triangles = np.stack((p2, base + half_width * normal, base - half_width * normal), axis=1)
+    arrows = to_data(triangles.reshape(-1, 2)).reshape(triangles.shape)
+
+    if is_loop.any():
+        angle = np.linspace(0, 2 * np.pi, LOOP_POINTS)
+        circle = LOOP_RADIUS * np.column_stack((np.cos(angle), np.sin(angle) + 1))
+        loops = src[is_loop][:, None] + circle[None]
+        for i, curve in zip(np.flatnonzero(is_loop).tolist(), loops):
+            curves[i] = curve
+        label_xy[is_loop] = src[is_loop] + (0, 2 * LOOP_RADIUS)
+    return curves, arrows, label_xy
 
-        # Position du texte pour les poids
-        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-        offset_x, offset_y = (y2 - y1) * rad * 0.5, (x1 - x2) * rad * 0.5
-        text_x, text_y = mid_x + offset_x, mid_y + offset_y
-        ax.text(text_x, text_y, str(weight), color="darkblue", fontsize=7, ha="center", va="center", backgroundcolor="white")
 
-        canvas.draw()
+def _unit(vectors):
+    norm = np.hypot(vectors[:, 0], vectors[:, 1])[:, None]
+    return np.divide(vectors, norm, out=np.zeros_like(vectors), where=norm > 0)
@@ -0,0 +1,97 @@
+from graph_operations import GraphScene, draw_scene
+
+ZOOM_STEP = 1.25
+PAN_BUTTONS = (2, 3)  # Bouton du milieu ou bouton droit
+
+
+class GraphView:
+    # Zoom à la molette autour du curseur et déplacement en glissant avec le
+    # bouton du milieu ou le bouton droit. La scène (tableaux du graphe) est
+    # gardée entre deux modifications : un changement de vue ne redessine que
+    # ce qui est visible (draw_scene). Pendant un glissement, seules les
+    # limites bougent ; la marge dessinée autour de la vue évite le vide et
+    # la scène est redessinée au relâchement
+    def __init__(self, ax, canvas):
+        self.ax = ax
+        self.canvas = canvas
+        self.G = None
+        self.pos = None
+        self.stable_set = ()
+        self.scene = None
+        self.scale = 1.0
+        self.drag = None
+        ax.graph_view = self  # Trouvée par redrawGraph et draw_edge
+        canvas.mpl_connect("scroll_event", self.on_scroll)
+        canvas.mpl_connect("button_press_event", self.on_press)
+        canvas.mpl_connect("motion_notify_event", self.on_motion)
+        canvas.mpl_connect("button_release_event", self.on_release)
+
+    def show(self, G, pos, stable_set=()):
+        self.G, self.pos, self.stable_set = G, pos, stable_set
+        self.scene = None
+        self.refresh()
+
+    def invalidate(self):
+        # Graphe modifié sans redessin complet : scène reconstruite au
+        # prochain changement de vue
+        self.scene = None
+
+    def refresh(self):
+        if self.G is None:
+            return
+        if self.scene is None:
+            self.scene = GraphScene(self.G, self.pos, self.stable_set)
+        self.scale = draw_scene(self.ax, self.scene)
+        self.canvas.draw_idle()
+
+    def home(self):
+        self.reset_limits(self.pos)
+        self.refresh()
+
+    def reset_limits(self, pos):
+        # Vue de départ : le carré [0, 1]², agrandi si des sommets en sortent
+        low, high = [0.0, 0.0], [1.0, 1.0]
+        for x, y in (pos or {}).values():
+            low = [min(low[0], x), min(low[1], y)]
+            high = [max(high[0], x), max(high[1], y)]
+        self.ax.set_xlim(low[0], high[0])
+        self.ax.set_ylim(low[1], high[1])
+
+    def span(self):
+        # Largeur visible, en coordonnées des données (1 dans la vue de départ)
+        x0, x1 = self.ax.get_xlim()
+        return abs(x1 - x0)
+
+    def zoom(self, factor, x, y):
+        # factor < 1 : rapprocher ; (x, y) reste sous le curseur
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        self.ax.set_xlim(x - (x - x0) * factor, x + (x1 - x) * factor)
+        self.ax.set_ylim(y - (y - y0) * factor, y + (y1 - y) * factor)
+        self.refresh()
+
+    def on_scroll(self, event):
+        if event.inaxes is not self.ax:
+            return
+        self.zoom(1 / ZOOM_STEP if event.button == "up" else ZOOM_STEP, event.xdata, event.ydata)
+
+    def on_press(self, event):
+        if event.inaxes is self.ax and event.button in PAN_BUTTONS:
+            self.drag = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def on_motion(self, event):
+        if self.drag is None:
+            return
+        # Déplacement mesuré en pixels : les coordonnées des données
+        # bougent avec la vue pendant le glissement
+        start_x, start_y, (x0, x1), (y0, y1) = self.drag
+        dx = (event.x - start_x) * (x1 - x0) / self.ax.bbox.width
+        dy = (event.y - start_y) * (y1 - y0) / self.ax.bbox.height
+        self.ax.set_xlim(x0 - dx, x1 - dx)
+        self.ax.set_ylim(y0 - dy, y1 - dy)
+        self.canvas.draw_idle()
+
+    def on_release(self, event):
+        if self.drag is not None and event.button in PAN_BUTTONS:
+            self.drag = None
+            self.refresh()
@@ -1,8 +1,4 @@
-import os
 import sys
-import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
 from PyQt5.QtWidgets import (
     QMainWindow,
     QVBoxLayout,
@@ -18,16 +14,15 @@ from PyQt5.QtWidgets import (
     QAction,
     QApplication,
     QFrame,
+    QFileDialog,
+    QProgressDialog,
 )
 import random
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from graph_operations import redrawGraph, addNode, draw_edge
-from bellman_ford_window import BellmanFordWindow
-from Animation_window import AnimationWindow
-from dijkstra_window import DijkstraWindow
-import pickle
+from PyQt5.QtCore import Qt, QTimer
+from algorithmes.result_cache import ResultCache
+from session import get_current_user, set_current_user
+from storage import get_store
 
 button_style = """
 QPushButton {
@@ -87,33 +82,25 @@ QMenu::separator {
 }
 """
 
+POLL_INTERVAL = 50  # ms entre deux relevés d'un travail de fond
 
-def load_user_data():
-    if not os.path.exists("user_data.pkl"):
-        return {}
-    with open("user_data.pkl", "rb") as file:
-        data = pickle.load(file)
-        return data
 
+class JobProgress(QProgressDialog):
+    # Dialogue de progression d'un travail de fond (background_job) : poll()
+    # est appelé toutes les POLL_INTERVAL ms pour relever le travail, Annuler
+    # l'annule. maximum=0 : progression indéterminée
+    def __init__(self, parent, job, label, poll, maximum=100):
+        super().__init__(label, "Annuler", 0, maximum, parent)
+        self.setWindowModality(Qt.WindowModal)
+        self.canceled.connect(job.cancel)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(poll)
+        job.start()
+        self.timer.start(POLL_INTERVAL)
 
-def save_user_data(data):
-    with open("user_data.pkl", "wb") as file:
-        pickle.dump(data, file)
-
-
-def get_current_user():
-    if os.path.exists("current_user.txt"):
-        with open("current_user.txt", "r") as file:
-            return file.read().strip()
-    return None
-
-
-def set_current_user(username):
-    with open("current_user.txt", "w") as file:
-        file.write(username if username is not None else "")
-
-
-mock_database = load_user_data()
+    def finish(self):
+        self.timer.stop()
+        self.close()
 
 
 class MainMenu(QMainWindow):
@@ -150,6 +137,7 @@ class MainMenu(QMainWindow):
 
     def new_graph(self):
         self.graph_designer = GraphDesigner()
+        self.graph_designer.recover_draft()
         self.graph_designer.show()
         self.close()
 
@@ -207,8 +195,8 @@ class LoginPage(QMainWindow):
     def login(self):
         username = self.username_input.text()
         password = self.password_input.text()
-        user_data = load_user_data()
-        if username in user_data and user_data[username]["password"] == password:
+        stored_password = get_store().get_password(username)
+        if stored_password is not None and stored_password == password:
             set_current_user(username)
             print(f"Logged in as: {username}")  # Debug print
             self.main_menu = MainMenu()
@@ -265,16 +253,15 @@ class RegisterPage(QMainWindow):
     def register(self):
         username = self.username_input.text()
         password = self.password_input.text()
-        user_data = load_user_data()
-        if username in user_data:
+        store = get_store()
+        if store.user_exists(username):
             QMessageBox.warning(
                 self,
                 "Erreur",
                 "Nom d'utilisateur existe deja. Essayez plutôt de vous connecter.",
             )
         else:
-            user_data[username] = {"password": password, "graphs": {}}
-            save_user_data(user_data)
+            store.add_user(username, password)
             QMessageBox.information(
                 self,
                 "Succès",
@@ -287,6 +274,9 @@ class RegisterPage(QMainWindow):
 
 class GraphDesigner(QMainWindow):
     def __init__(self):
+        import networkx as nx
+        from spatial_index import SpatialIndex
+
         super().__init__()
         self.initUI()
         self.mode = None
@@ -294,12 +284,100 @@ class GraphDesigner(QMainWindow):
         self.G = nx.DiGraph()
         self.G.graph_designer = self  # Assign the graph designer to the graph object
         self.pos = {}
+        # Recherche du sommet / de l'arête sous un clic
+        self.spatial_index = SpatialIndex(self.G, self.pos)
         self.stable_sets = {}
         self.animation_steps = []
         self.animation_windows = []
         self.node_counter = 1  # Initialize the node counter
+        # Incrémenté à chaque modification : invalide les résultats en cache
+        self.graph_version = 0
+        self.result_cache = ResultCache()
+        # Journal d'édition du graphe courant (graph_name=None : brouillon)
+        self.graph_name = None
+        self.journal = None
+        self.journaling = True
+        self.compaction = None
+
+    def bump_graph_version(self):
+        self.graph_version += 1
+        self.result_cache.set_version(self.graph_version)
+
+    def record_edit(self, op, **fields):
+        # Chaque modification est écrite dans le journal dès qu'elle est faite
+        from journal import COMPACT_EVERY, EditJournal
+
+        if not self.journaling:
+            return
+        if self.journal is None:
+            self.journal = EditJournal(get_store().journal_path(get_current_user(), None))
+        foreign = self.journal.append(op, **fields)
+        if foreign:
+            self.apply_foreign_edits(foreign)
+        if self.graph_name is not None and self.journal.pending >= COMPACT_EVERY:
+            self.compact_journal()
+
+    def sync_journal(self):
+        # Modifications faites sur ce graphe par une autre session ouverte
+        if self.journal is not None:
+            foreign = self.journal.pull()
+            if foreign:
+                self.apply_foreign_edits(foreign)
+
+    def apply_foreign_edits(self, records):
+        from journal import replay
+
+        self.node_counter = replay(self.G, self.pos, self.node_counter, records)
+        self.spatial_index.rebuild(self.G, self.pos)
+        self.bump_graph_version()
+        self.redraw_graph()
+
+    def compact_journal(self):
+        # Fusion du journal dans le fichier du graphe, sur un thread de fond
+        import threading
+        from journal import compact
+
+        if self.graph_name is None or self.journal is None:
+            return
+        if self.compaction is not None and self.compaction.is_alive():
+            return
+        self.compaction = threading.Thread(
+            target=compact,
+            args=(get_store().path, get_current_user(), self.graph_name, self.journal),
+            daemon=True,
+        )
+        self.compaction.start()
+
+    def recover_draft(self):
+        # Brouillon d'une session interrompue avant le premier enregistrement
+        from journal import EditJournal, replay
+
+        journal = EditJournal(get_store().journal_path(get_current_user(), None))
+        records = journal.records()
+        if not records:
+            return
+        restore = QMessageBox.question(
+            self,
+            "Brouillon retrouvé",
+            "Un graphe non enregistré a été retrouvé. Voulez-vous le restaurer ?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if restore == QMessageBox.Yes:
+            self.node_counter = replay(self.G, self.pos, self.node_counter, records)
+            self.journal = journal
+            self.spatial_index.rebuild(self.G, self.pos)
+            self.bump_graph_version()
+            self.redraw_graph()
+            self.update_button_styles()
+        else:
+            journal.discard()
 
     def initUI(self):
+        # matplotlib n'est chargé qu'à l'ouverture du premier éditeur de graphe
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from graph_view import GraphView
+
         self.setWindowTitle("Graph Designer")
         self.setGeometry(100, 100, 1000, 600)
 
@@ -325,6 +403,8 @@ class GraphDesigner(QMainWindow):
         self.canvas = FigureCanvas(self.figure)
         self.canvas_layout.addWidget(self.canvas)
         main_layout.addWidget(self.canvas_frame)
+        # Zoom (molette) et déplacement (bouton droit ou du milieu)
+        self.view = GraphView(self.ax, self.canvas)
 
         self.algorithmsButton = QToolButton(self)
         self.algorithmsButton.setText("Algorithmes")
@@ -341,6 +421,11 @@ class GraphDesigner(QMainWindow):
             "Animer Welsh-Powell",
             self.animateWelshPowell,
         )
+        self.add_action_to_menu(
+            self.algorithmsMenu,
+            "Animer DSatur",
+            self.animateDSatur,
+        )
         self.add_action_to_menu(
             self.algorithmsMenu,
             "Animer Prim pour Le Max-st",
@@ -379,6 +464,12 @@ class GraphDesigner(QMainWindow):
         self.sauvegarderButton.setDisabled(True)
         button_layout.addWidget(self.sauvegarderButton)
 
+        self.importButton = QPushButton("Importer", self)
+        self.importButton.setFixedWidth(200)
+        self.importButton.setStyleSheet(button_style)
+        self.importButton.clicked.connect(self.import_graph)
+        button_layout.addWidget(self.importButton)
+
         self.addNodeButton = QPushButton("Ajouter sommet", self)
         self.addNodeButton.setFixedWidth(200)
         self.addNodeButton.setStyleSheet(button_style)
@@ -408,6 +499,12 @@ class GraphDesigner(QMainWindow):
         self.deleteEdgeButton.clicked.connect(self.toggle_delete_edge_mode)
         button_layout.addWidget(self.deleteEdgeButton)
 
+        self.homeViewButton = QPushButton("Recentrer la vue", self)
+        self.homeViewButton.setFixedWidth(200)
+        self.homeViewButton.setStyleSheet(button_style)
+        self.homeViewButton.clicked.connect(self.view.home)
+        button_layout.addWidget(self.homeViewButton)
+
         self.mainMenuButton = QPushButton("Menu Principal", self)
         self.mainMenuButton.setStyleSheet(button_style)
         self.mainMenuButton.setFixedWidth(200)
@@ -543,63 +640,195 @@ class GraphDesigner(QMainWindow):
         )
         if ok and name:
             username = get_current_user()
-            user_data = load_user_data()
-            if username in user_data:
-                existing_graphs = user_data[username]["graphs"]
-                if name in existing_graphs:
+            store = get_store()
+            if store.user_exists(username):
+                if name != self.graph_name and store.graph_exists(username, name):
                     overwrite = QMessageBox.question(
                         self,
                         "Graphe Existant",
                         "Un graphe avec ce nom existe déjà. Voulez-vous l'écraser ?",
                         QMessageBox.Yes | QMessageBox.No,
                     )
+                    saved = False
                     if overwrite == QMessageBox.Yes:
-                        self._save_graph_data(name, user_data)
+                        saved = self._save_graph_data(name)
                     else:
                         new_name, ok = QInputDialog.getText(
                             self, "Nouveau Nom", "Entrez le nouveau nom du graphe:"
                         )
                         if ok and new_name:
-                            self._save_graph_data(new_name, user_data)
+                            saved = self._save_graph_data(new_name)
                 else:
-                    self._save_graph_data(name, user_data)
-                self.sauvegarderButton.setDisabled(True)
+                    saved = self._save_graph_data(name)
+                if saved:
+                    self.sauvegarderButton.setDisabled(True)
+
+    def _save_graph_data(self, name):
+        from graph_format import graph_to_arrays
+        from journal import EditJournal
 
-    def _save_graph_data(self, name, user_data):
         username = get_current_user()
-        graph_data = {
-            "nodes": list(self.G.nodes()),
-            "edges": list(self.G.edges(data=True)),
-            "positions": {
-                node: (float(pos[0]), float(pos[1])) for node, pos in self.pos.items()
-            },
-            "node_counter": self.node_counter,
-        }
-        user_data[username]["graphs"][name] = graph_data
-        save_user_data(user_data)
+        store = get_store()
+        if name == self.graph_name and self.journal is not None:
+            # Les modifications sont déjà dans le journal : il reste à le
+            # fusionner, en arrière-plan
+            self.compact_journal()
+        else:
+            # Une exception ne doit pas sortir du slot Qt (PyQt5 arrête
+            # l'application) : le graphe courant resterait non enregistré
+            try:
+                journal = EditJournal(store.journal_path(username, name))
+                graph_data = graph_to_arrays(self.G, self.pos, self.node_counter)
+                # Entrées de l'ancien graphe de ce nom oubliées, numérotation conservée
+                graph_data["journal_seq"] = journal.reset(self.node_counter)
+                store.save_graph(username, name, graph_data)
+            except Exception as e:
+                QMessageBox.critical(self, "Erreur", f"Sauvegarde impossible : {e}")
+                return False
+            if self.graph_name is None and self.journal is not None:
+                self.journal.discard()  # Le brouillon est maintenant enregistré
+            self.graph_name = name
+            self.journal = journal
+            self.journaling = True
         QMessageBox.information(self, "Succès", "Graphe sauvegardé avec succès.")
+        return True
 
     def load_graph(self, name):
+        from graph_format import fill_graph
+        from journal import EditJournal, replay
+
         username = get_current_user()
-        user_data = load_user_data()
-        if username in user_data and name in user_data[username]["graphs"]:
-            graph_data = user_data[username]["graphs"][name]
+        store = get_store()
+        graph_data = store.load_graph(username, name)
+        if graph_data is not None:
             self.G.clear()
             self.pos.clear()
-            self.G.add_nodes_from(graph_data["nodes"])
-            self.G.add_edges_from((u, v, d) for u, v, d in graph_data["edges"])
-            self.pos = {
-                node: (pos[0], pos[1]) for node, pos in graph_data["positions"].items()
-            }
-            self.node_counter = graph_data.get(
-                "node_counter", max(graph_data["nodes"]) + 1
-            )  # Restore the node counter
+            # Insertion en bloc depuis les tableaux projetés en mémoire
+            self.pos = fill_graph(self.G, graph_data)
+            self.node_counter = graph_data["node_counter"]  # Restore the node counter
+            # Modifications journalisées pas encore fusionnées (session
+            # interrompue, ou compaction en cours)
+            self.graph_name = name
+            self.journaling = True
+            self.journal = EditJournal(store.journal_path(username, name), graph_data["journal_seq"])
+            records = self.journal.records(after=graph_data["journal_seq"])
+            if records:
+                self.node_counter = replay(self.G, self.pos, self.node_counter, records)
+                self.compact_journal()
+            self.spatial_index.rebuild(self.G, self.pos)
+            self.bump_graph_version()
+            self.view.reset_limits(self.pos)
             self.redraw_graph()
         else:
             QMessageBox.warning(
                 self, "Erreur", "Le graphe n'existe pas ou n'a pas été trouvé."
             )
 
+    def import_graph(self):
+        from graph_import import BackgroundImport
+
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importer un graphe",
+            "",
+            "Graphes (*.txt *.edges *.edgelist *.csv *.graphml);;Tous les fichiers (*)",
+        )
+        if not path:
+            return
+        import networkx as nx
+
+        # Le graphe importé est construit à part : le graphe courant reste
+        # intact si l'import est annulé ou échoue
+        self.imported_graph = nx.DiGraph()
+        self.start_import_job(BackgroundImport(path), "Import en cours...", self.poll_import)
+
+    def start_import_job(self, job, label, poll, maximum=100):
+        # Lecture puis disposition du graphe importé : une seule étape à la
+        # fois, suivie par import_progress jusqu'à end_import()
+        self.import_job = job
+        self.import_progress = JobProgress(self, job, label, poll, maximum)
+        self.importButton.setDisabled(True)
+
+    def poll_import(self):
+        from graph_import import uniform_node_ids
+
+        job = self.import_job
+        for nodes, edges in job.take_chunks():
+            self.imported_graph.add_nodes_from(nodes)
+            self.imported_graph.add_weighted_edges_from(edges)
+        if job.cancelled:
+            self.end_import()
+            return
+        self.import_progress.setValue(int(job.progress * 100))
+        self.import_progress.setLabelText(
+            f"Import en cours... {self.imported_graph.number_of_edges()} arcs"
+        )
+        if not job.done:
+            return
+        graph = self.imported_graph
+        self.end_import()
+        if job.error is not None:
+            QMessageBox.critical(self, "Erreur", f"Import impossible : {job.error}")
+            return
+        uniform_node_ids(graph)
+        self.layout_graph(graph)
+
+    def layout_graph(self, graph):
+        from algorithm_worker import BackgroundRun
+        from graph_layout import auto_layout
+
+        # Les fichiers importés n'ont pas de positions : disposition calculée
+        # sur un thread de fond (une étape par itération, pour l'annulation)
+        self.imported_graph = graph
+        self.start_import_job(
+            BackgroundRun(lambda emit: auto_layout(graph, callback=emit)),
+            "Disposition du graphe...",
+            self.poll_layout,
+            maximum=0,
+        )
+
+    def poll_layout(self):
+        job = self.import_job
+        job.take_steps()
+        if job.cancelled:
+            self.end_import()
+            return
+        if not job.done:
+            return
+        graph = self.imported_graph
+        self.end_import()
+        if job.error is not None:
+            QMessageBox.critical(self, "Erreur", f"Disposition impossible : {job.error}")
+            return
+        self.finish_import(graph, job.result)
+
+    def end_import(self):
+        self.import_progress.finish()
+        self.importButton.setEnabled(True)
+        self.import_job = None
+        self.imported_graph = None
+
+    def finish_import(self, graph, pos):
+        graph.graph_designer = self
+        self.G = graph
+        # Un graphe importé n'est journalisé qu'une fois enregistré
+        if self.graph_name is None and self.journal is not None:
+            self.journal.discard()
+        self.graph_name = None
+        self.journal = None
+        self.journaling = False
+        self.pos = pos
+        self.node_counter = max(
+            (node for node in graph.nodes() if isinstance(node, int)), default=0
+        ) + 1
+        self.spatial_index.rebuild(self.G, self.pos)
+        self.bump_graph_version()
+        self.view.reset_limits(self.pos)
+        self.redraw_graph()  # Un seul rendu, à la fin de l'import
+        self.update_button_styles()
+        if graph.number_of_nodes() > 0:
+            self.reset_buttons_states()
+
     def reset_buttons_states(self):
         self.algorithmsButton.setEnabled(True)
         self.sauvegarderButton.setEnabled(True)
@@ -623,56 +852,99 @@ class GraphDesigner(QMainWindow):
         self.find_menu_action(self.algorithmsMenu, "Animer Dijkstra").setEnabled(True)
 
     def animateWelshPowell(self):
-        animation_window = AnimationWindow(self.G, self.pos, algorithm="welsh_powell")
+        from Animation_window import AnimationWindow
+
+        animation_window = AnimationWindow(
+            self.G, self.pos, algorithm="welsh_powell", cache=self.result_cache
+        )
         self.animation_windows.append(animation_window)
         animation_window.show()
         # self.stable_sets = self.get_stable_sets_from_colors(animation_window.color_map)
         # self.find_menu_action(self.algorithmsMenu, "Trouver ensemble stable maximal").setEnabled(True)
 
+    def animateDSatur(self):
+        from Animation_window import AnimationWindow
+
+        animation_window = AnimationWindow(
+            self.G, self.pos, algorithm="dsatur", cache=self.result_cache
+        )
+        self.animation_windows.append(animation_window)
+        animation_window.show()
+
     def animateKruskal(self):
-        animation_window = AnimationWindow(self.G, self.pos, algorithm="kruskal")
+        from Animation_window import AnimationWindow
+
+        animation_window = AnimationWindow(
+            self.G, self.pos, algorithm="kruskal", cache=self.result_cache
+        )
         self.animation_windows.append(animation_window)
         animation_window.show()
 
     def animateKruskalMax(self):
-        animation_window = AnimationWindow(self.G, self.pos, algorithm="kruskalMax")
+        from Animation_window import AnimationWindow
+
+        animation_window = AnimationWindow(
+            self.G, self.pos, algorithm="kruskalMax", cache=self.result_cache
+        )
         self.animation_windows.append(animation_window)
         animation_window.show()
 
     def animatePrim(self):
+        from Animation_window import AnimationWindow
+
         start_node = random.choice(list(self.G.nodes()))
         animation_window = AnimationWindow(
-            self.G, self.pos, algorithm="prim", start_node=start_node
+            self.G,
+            self.pos,
+            algorithm="prim",
+            start_node=start_node,
+            cache=self.result_cache,
         )
         self.animation_windows.append(animation_window)
         animation_window.show()
 
     def animatePrimMax(self):
+        from Animation_window import AnimationWindow
+
         start_node = random.choice(list(self.G.nodes()))
         animation_window = AnimationWindow(
-            self.G, self.pos, algorithm="primMax", start_node=start_node
+            self.G,
+            self.pos,
+            algorithm="primMax",
+            start_node=start_node,
+            cache=self.result_cache,
         )
         self.animation_windows.append(animation_window)
         animation_window.show()
 
     def animateDijkstra(self):
-        animation_window = DijkstraWindow(self.G, self.pos)
+        from dijkstra_window import DijkstraWindow
+
+        animation_window = DijkstraWindow(self.G, self.pos, cache=self.result_cache)
         self.animation_windows.append(animation_window)
         animation_window.show()
 
     def animateBellmanFord(self):
+        from bellman_ford_window import BellmanFordWindow
+
         try:
-            bellman_ford_window = BellmanFordWindow(self.G, self.pos)
+            bellman_ford_window = BellmanFordWindow(self.G, self.pos, cache=self.result_cache)
             bellman_ford_window.show()
             self.animation_windows.append(bellman_ford_window)
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Une erreur s'est produite: {str(e)}")
 
     def on_click(self, event):
-        if event.inaxes:
+        from graph_operations import addNode
+
+        # Les autres boutons servent à déplacer la vue (GraphView)
+        if event.inaxes and event.button == 1:
             x, y = event.xdata, event.ydata
+            self.sync_journal()
             if self.mode == "add_node":
-                addNode(self.G, self.pos, x, y, self.ax, self.canvas)
+                node_id = addNode(self.G, self.pos, x, y, self.ax, self.canvas)
+                self.record_edit("add_node", node=node_id, pos=list(self.pos[node_id]))
+                self.bump_graph_version()
                 if len(self.G.nodes) > 0:
                     self.addEdgeButton.setEnabled(True)
                     self.deleteNodeButton.setEnabled(True)
@@ -687,7 +959,11 @@ class GraphDesigner(QMainWindow):
                 self.handle_edge_deletion(x, y)
 
     def handle_edge_creation(self, x, y):
+        from graph_operations import draw_edge
+
         node_id = self.get_closest_node(x, y)
+        if node_id is None:
+            return
         if self.selected_node_for_edge_creation is None:
             self.selected_node_for_edge_creation = node_id
         else:
@@ -697,6 +973,9 @@ class GraphDesigner(QMainWindow):
                 )
                 if ok:
                     self.G.add_edge(node_id, node_id, weight=weight)
+                    self.spatial_index.add_edge(node_id, node_id)
+                    self.record_edit("add_edge", u=node_id, v=node_id, weight=weight)
+                    self.bump_graph_version()
                     self.draw_loop(self.ax, self.pos, node_id, weight, self.canvas)
             else:
                 weight, ok = QInputDialog.getInt(
@@ -706,6 +985,14 @@ class GraphDesigner(QMainWindow):
                     self.G.add_edge(
                         self.selected_node_for_edge_creation, node_id, weight=weight
                     )
+                    self.spatial_index.add_edge(self.selected_node_for_edge_creation, node_id)
+                    self.record_edit(
+                        "add_edge",
+                        u=self.selected_node_for_edge_creation,
+                        v=node_id,
+                        weight=weight,
+                    )
+                    self.bump_graph_version()
                     draw_edge(
                         self.ax,
                         self.pos,
@@ -717,7 +1004,11 @@ class GraphDesigner(QMainWindow):
             self.selected_node_for_edge_creation = None
 
     def handle_node_deletion(self, x, y):
+        from graph_operations import redrawGraph
+
         node_id = self.get_closest_node(x, y)
+        if node_id is None:
+            return
         confirm = QMessageBox.question(
             self,
             "Confirm Deletion",
@@ -725,14 +1016,19 @@ class GraphDesigner(QMainWindow):
             QMessageBox.Yes | QMessageBox.No,
         )
         if confirm == QMessageBox.Yes:
+            self.spatial_index.remove_node(node_id)
             self.G.remove_node(node_id)
             del self.pos[node_id]
+            self.record_edit("remove_node", node=node_id)
+            self.bump_graph_version()
             redrawGraph(self.ax, self.G, self.pos, [], self.canvas)
             self.sauvegarderButton.setEnabled(True)
             self.mode = "deleting_nodes" if self.deleteNodeButton.isChecked() else None
             self.update_button_styles()
 
     def handle_edge_deletion(self, x, y):
+        from graph_operations import redrawGraph
+
         closest_edge = self.get_closest_edge(x, y)
         if closest_edge is not None:
             confirm = QMessageBox.question(
@@ -743,6 +1039,9 @@ class GraphDesigner(QMainWindow):
             )
             if confirm == QMessageBox.Yes:
                 self.G.remove_edge(*closest_edge)
+                self.spatial_index.remove_edge(*closest_edge)
+                self.record_edit("remove_edge", u=closest_edge[0], v=closest_edge[1])
+                self.bump_graph_version()
                 redrawGraph(self.ax, self.G, self.pos, [], self.canvas)
                 self.sauvegarderButton.setEnabled(True)
                 self.mode = (
@@ -751,111 +1050,29 @@ class GraphDesigner(QMainWindow):
                 self.update_button_styles()
 
     def get_closest_node(self, x, y):
-        return min(
-            self.G.nodes, key=lambda n: np.hypot(self.pos[n][0] - x, self.pos[n][1] - y)
-        )
+        return self.spatial_index.nearest_node(x, y)
 
     def get_closest_edge(self, x, y):
-        def distance_from_point_to_line(px, py, x1, y1, x2, y2):
-            line_mag = np.hypot(x2 - x1, y2 - y1)
-            u = ((px - x1) * (x2 - x1) + (py - y1) * (y2 - y1)) / (line_mag**2)
-            if u < 0 or u > 1:
-                return min(np.hypot(px - x1, py - y1), np.hypot(px - x2, py - y2))
-            ix = x1 + u * (x2 - x1)
-            iy = y1 + u * (y2 - y1)
-            return np.hypot(px - ix, py - iy)
-
-        closest_edge = min(
-            self.G.edges,
-            key=lambda e: distance_from_point_to_line(
-                x,
-                y,
-                self.pos[e[0]][0],
-                self.pos[e[0]][1],
-                self.pos[e[1]][0],
-                self.pos[e[1]][1],
-            ),
-        )
-        distance = distance_from_point_to_line(
-            x,
-            y,
-            self.pos[closest_edge[0]][0],
-            self.pos[closest_edge[0]][1],
-            self.pos[closest_edge[1]][0],
-            self.pos[closest_edge[1]][1],
-        )
-        if distance < 0.05:  # Adjust the threshold as needed
-            return closest_edge
-        return None
+        from spatial_index import HIT_RADIUS
+
+        # Rayon de clic constant à l'écran, quel que soit le zoom
+        return self.spatial_index.nearest_edge(x, y, HIT_RADIUS * self.view.span())
 
     def draw_loop(self, ax, pos, node_id, weight, canvas):
-        x, y = pos[node_id]
-        loop_radius = 0.05  # Augmenter le rayon pour plus de visibilité
-        loop = plt.Circle(
-            (x, y + loop_radius),
-            loop_radius,
-            color="black",
-            fill=False,
-            linestyle="-",
-            linewidth=1,
-        )
-        ax.add_patch(loop)
-        # Décaler le texte pour qu'il soit au-dessus de la boucle et non à l'intérieur
-        ax.text(
-            x,
-            y + 2 * loop_radius,
-            str(weight),
-            color="darkblue",  # Changer la couleur pour une meilleure visibilité
-            fontsize=7,  # Ajuster la taille du texte si nécessaire
-            ha="center",
-            va="center",
-            bbox=dict(
-                facecolor="white", edgecolor="none", pad=2
-            ),  # Ajouter un fond pour le texte
-        )
-        canvas.draw()
+        from graph_operations import draw_edge
+
+        draw_edge(ax, pos, node_id, node_id, weight, canvas)
 
     def redraw_graph(self):
-        self.ax.clear()
-        nx.draw(
-            self.G,
-            pos=self.pos,
-            ax=self.ax,
-            with_labels=True,
-            node_color="lightblue",
-            node_size=700,
-            edge_color="gray",
-        )
-        for u, v, d in self.G.edges(data=True):
-            if u == v:
-                x, y = self.pos[u]
-                loop_radius = 0.03
-                loop = plt.Circle((x, y), loop_radius, color="black", fill=False)
-                self.ax.add_patch(loop)
-                self.ax.text(
-                    x + loop_radius,
-                    y + loop_radius,
-                    str(d["weight"]),
-                    color="red",
-                    fontsize=12,
-                    ha="center",
-                    va="center",
-                )
-            else:
-                self.ax.text(
-                    (self.pos[u][0] + self.pos[v][0]) / 2,
-                    (self.pos[u][1] + self.pos[v][1]) / 2,
-                    str(d["weight"]),
-                    color="red",
-                    fontsize=12,
-                    ha="center",
-                    va="center",
-                )
-        self.canvas.draw()
+        from graph_operations import redrawGraph
+
+        redrawGraph(self.ax, self.G, self.pos, [], self.canvas)
 
     def animateBellmanFord(self):
+        from bellman_ford_window import BellmanFordWindow
+
         try:
-            bellman_ford_window = BellmanFordWindow(self.G)
+            bellman_ford_window = BellmanFordWindow(self.G, self.pos, cache=self.result_cache)
             bellman_ford_window.show()
             self.animation_windows.append(bellman_ford_window)
         except Exception as e:
@@ -0,0 +1,176 @@
+import json
+import os
+
+from file_lock import FileLock, temp_path
+
+# Journal d'édition d'un graphe : chaque modification faite dans l'éditeur
+# est ajoutée en fin de fichier (une ligne JSON numérotée) et synchronisée sur
+# disque, donc une session interrompue ne perd rien. Le journal est ensuite
+# fusionné (compaction) dans le fichier du graphe par un thread de fond ; le
+# fichier du graphe retient le numéro de la dernière entrée fusionnée, ce qui
+# permet de rejouer au chargement exactement les entrées manquantes.
+# Plusieurs sessions peuvent éditer le même graphe : les numéros sont
+# attribués sous le verrou du graphe et chaque session rejoue les entrées des
+# autres (pull), donc les modifications se fusionnent au lieu de s'écraser.
+# Après une compaction, le journal commence par une entrée "checkpoint" qui
+# garde la numérotation et le compteur de sommets
+COMPACT_EVERY = 256
+
+
+class EditJournal:
+    def __init__(self, path, last_seq=0):
+        self.path = path
+        self.lock_path = path + ".lock"  # Même verrou que GraphStore.lock
+        records = self.records(after=last_seq)
+        self.last_seq = max([last_seq] + [record["seq"] for record in records])
+        self.pending = _edit_count(records)
+        self._seen = _stat(path)
+
+    def append(self, op, **fields):
+        # Ajoute une entrée ; renvoie les entrées d'autres sessions arrivées
+        # depuis la dernière lecture, à rejouer par l'appelant
+        with FileLock(self.lock_path):
+            foreign = self._read_new()
+            self.last_seq += 1
+            record = dict(fields, op=op, seq=self.last_seq)
+            # Ouvert à chaque ajout : la compaction peut remplacer le fichier
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            self._seen = _stat(self.path)
+            self.pending += 1
+        return foreign
+
+    def pull(self):
+        # Entrées d'autres sessions, lues sans verrou : un écrivain ne bloque
+        # pas la lecture (une ligne en cours d'écriture est relue plus tard)
+        return self._read_new()
+
+    def _read_new(self):
+        seen = _stat(self.path)
+        if seen == self._seen:
+            return []
+        records = self.records(after=self.last_seq)
+        self._seen = seen
+        if records:
+            self.last_seq = max(self.last_seq, records[-1]["seq"])
+            self.pending += _edit_count(records)
+        return records
+
+    def records(self, after=0):
+        # Entrées de numéro > after ; une dernière ligne tronquée (arrêt
+        # pendant une écriture) est ignorée
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record["seq"] > after:
+                    records.append(record)
+        return records
+
+    def drop_through(self, seq, node_counter):
+        # Retire les entrées déjà fusionnées dans le fichier du graphe
+        with FileLock(self.lock_path):
+            self._rewrite(seq, node_counter)
+
+    def reset(self, node_counter):
+        # Oublie toutes les entrées (le graphe est réécrit en entier) ; renvoie
+        # le numéro à enregistrer dans le nouveau fichier du graphe
+        with FileLock(self.lock_path):
+            records = self.records()
+            self.last_seq = max([self.last_seq] + [record["seq"] for record in records])
+            self._rewrite(self.last_seq, node_counter)
+            self._seen = _stat(self.path)
+        return self.last_seq
+
+    def _rewrite(self, seq, node_counter):
+        remaining = [
+            record for record in self.records(after=seq) if record["op"] != "checkpoint"
+        ]
+        checkpoint = {"op": "checkpoint", "seq": seq, "node_counter": node_counter}
+        tmp = temp_path(self.path)
+        with open(tmp, "w", encoding="utf-8") as file:
+            file.writelines(json.dumps(record) + "\n" for record in [checkpoint] + remaining)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, self.path)
+        self.pending = len(remaining)
+
+    def discard(self):
+        with FileLock(self.lock_path):
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.pending = 0
+            self._seen = None
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def _edit_count(records):
+    return sum(record["op"] != "checkpoint" for record in records)
+
+
+def replay(G, pos, node_counter, records):
+    # Applique les entrées à G et pos ; renvoie le compteur de sommets à jour
+    for record in records:
+        op = record["op"]
+        if op == "add_node":
+            node = record["node"]
+            G.add_node(node)
+            pos[node] = tuple(record["pos"])
+            if isinstance(node, int):
+                node_counter = max(node_counter, node + 1)
+        elif op == "add_edge":
+            u, v = record["u"], record["v"]
+            if u in G and v in G:
+                G.add_edge(u, v, weight=record["weight"])
+        elif op == "remove_node":
+            if record["node"] in G:
+                G.remove_node(record["node"])
+            pos.pop(record["node"], None)
+        elif op == "remove_edge":
+            if G.has_edge(record["u"], record["v"]):
+                G.remove_edge(record["u"], record["v"])
+        elif op == "checkpoint":
+            node_counter = max(node_counter, record["node_counter"])
+    return node_counter
+
+
+def compact(store_path, username, name, journal):
+    # Fusionne le journal dans le fichier du graphe. Prévu pour un thread de
+    # fond : connexion SQLite propre, aucun accès à l'état de l'éditeur. Si une
+    # autre session a fusionné entre-temps, rien n'est écrit
+    import networkx as nx
+    from graph_format import fill_graph, graph_to_arrays
+    from storage import GraphStore
+
+    store = GraphStore(store_path, legacy_path=None)
+    try:
+        arrays = store.load_graph(username, name)
+        if arrays is None:
+            return
+        base = arrays["journal_seq"]
+        records = journal.records(after=base)
+        if not _edit_count(records):
+            return
+        G = nx.DiGraph()
+        pos = fill_graph(G, arrays)
+        node_counter = replay(G, pos, arrays["node_counter"], records)
+        compacted = graph_to_arrays(G, pos, node_counter)
+        compacted["journal_seq"] = records[-1]["seq"]
+        if store.save_graph(username, name, compacted, expect_seq=base):
+            journal.drop_through(compacted["journal_seq"], node_counter)
+    finally:
+        store.close()
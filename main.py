@@ -1,9 +1,24 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from gui import LoginPage
+import time
 
 if __name__ == "__main__":
+    started = time.perf_counter()
+    # --startup-timing : affiche le coût des imports et le temps jusqu'au premier
+    # affichage de la fenêtre de connexion (--startup-budget=<ms> pour le seuil)
+    timing = "--startup-timing" in sys.argv
+    if timing and "importtime" not in sys._xoptions:
+        from startup_timing import run_with_import_times
+
+        sys.exit(run_with_import_times(sys.argv))
+
+    from PyQt5.QtWidgets import QApplication
+    from gui import LoginPage
+
     app = QApplication(sys.argv)
     login_page = LoginPage()
     login_page.show()
+    if timing:
+        from startup_timing import report_first_paint, startup_budget_ms
+
+        report_first_paint(app, login_page, started, startup_budget_ms(sys.argv))
     sys.exit(app.exec_())
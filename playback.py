@@ -0,0 +1,168 @@
+import time
+from itertools import islice
+
+from PyQt5.QtCore import QTimer
+
+FRAME_INTERVAL = 16  # ms : une soixantaine d'images par seconde au plus
+SPEEDS = (1, 2, 5, 10, 50, 200, 1000, 2000, 10000)  # Étapes par seconde
+DEFAULT_SPEED = 1
+LABELS_PER_FRAME = 24  # Étiquettes réécrites par image au plus (PendingLabels)
+
+
+class Playback:
+    # Lecture d'une animation depuis un tampon d'étapes indexé : rien n'est
+    # consommé, on peut revenir en arrière ou sauter à n'importe quelle étape.
+    # position est le nombre d'étapes affichées (0 : état initial).
+    # La position avance selon le temps réellement écoulé et la vitesse
+    # (étapes par seconde) : si le dessin prend du retard, l'image suivante
+    # applique plusieurs étapes d'un coup (saut d'images) au lieu de ralentir.
+    # La fenêtre fournit :
+    # - advance(start, end) : dessine les étapes start..end-1 sur l'image courante ;
+    # - seek(position) : reconstruit l'image après position étapes (keyframes
+    #   de DeltaTrace, ou préfixe de la liste d'événements) ;
+    # - finish() : fin de l'animation, une fois le calcul terminé ;
+    # - settle() : la lecture s'arrête (pause, saut en pause, fin) ; ce qui a
+    #   été différé pendant la lecture rapide peut être dessiné
+    def __init__(self, parent, advance, seek, finish=None, settle=None, on_change=None):
+        self.advance = advance
+        self.seek_to = seek
+        self.finish = finish
+        self.settle = settle
+        self.on_change = None
+        self.rate = DEFAULT_SPEED
+        self.timer = QTimer(parent)
+        self.timer.timeout.connect(self.tick)
+        self.clear()
+        self.on_change = on_change  # Barre de lecture, bouton lecture/pause
+
+    def clear(self):
+        self.timer.stop()
+        self.length = 0
+        self.position = 0
+        self.complete = False  # Plus aucune étape à venir
+        self.paused = False
+        self._due = 0.0
+        self._last = time.monotonic()
+        self._changed()
+
+    @property
+    def playing(self):
+        return self.timer.isActive()
+
+    def extend(self, count):
+        # count étapes de plus dans le tampon ; la lecture démarre d'elle-même
+        self.length += count
+        if not self.paused and not self.playing:
+            self.play()
+        else:
+            self._changed()
+
+    def close(self):
+        # Le calcul est terminé (ou annulé) : la fin du tampon est la fin
+        self.complete = True
+        if not self.paused and not self.playing:
+            self.play()
+        else:
+            self._changed()
+
+    def play(self):
+        if self.complete and self.position == self.length and self.length:
+            self.seek(0)  # Relancer depuis le début
+        self.paused = False
+        self._due = 1.0  # Première étape affichée tout de suite
+        self._last = time.monotonic()
+        self.timer.start(self._interval())
+        self.tick()
+
+    def pause(self):
+        self.paused = True
+        self.timer.stop()
+        self._settle()
+        self._changed()
+
+    def stop(self):
+        self.timer.stop()
+
+    def set_rate(self, rate):
+        self.rate = rate
+        if self.playing:
+            self.timer.setInterval(self._interval())
+
+    def _interval(self):
+        return max(FRAME_INTERVAL, round(1000 / self.rate))
+
+    def tick(self):
+        now = time.monotonic()
+        self._due += (now - self._last) * self.rate
+        self._last = now
+        steps = int(self._due)
+        available = self.length - self.position
+        if steps > available:
+            # Lecture en avance sur le calcul : rien à rattraper ensuite
+            steps, self._due = available, 0.0
+        else:
+            self._due -= steps
+        if steps:
+            # Plusieurs étapes d'un coup si l'image précédente a pris du retard
+            self.advance(self.position, self.position + steps)
+            self.position += steps
+        if self.complete and self.position == self.length:
+            self._end()
+        self._changed()
+
+    def seek(self, position):
+        # Saut depuis la barre de lecture ; la lecture continue de là
+        position = min(max(position, 0), self.length)
+        self.seek_to(position)
+        self.position = position
+        self._due = 0.0
+        self._last = time.monotonic()
+        if position < self.length:
+            if self.paused:
+                self._settle()
+            elif not self.playing:
+                self.timer.start(self._interval())
+        elif self.complete:
+            self._end()
+        self._changed()
+
+    def _end(self):
+        self.timer.stop()
+        self._settle()
+        if self.finish is not None:
+            self.finish()
+
+    def _settle(self):
+        if self.settle is not None:
+            self.settle()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+
+class PendingLabels:
+    # Étiquettes (sommet -> valeur) à réécrire pendant la lecture : chaque
+    # image en dessine au plus LABELS_PER_FRAME, les plus anciennes d'abord,
+    # et le reste suit aux images suivantes. Une étiquette coûte quelques
+    # millisecondes à dessiner : sans limite, une lecture rapide passerait
+    # son temps à les écrire. flush() sans limite à l'arrêt de la lecture
+    def __init__(self, show):
+        self.show = show
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def clear(self):
+        self.pending = {}
+
+    def update(self, items):
+        self.pending.update(items)
+
+    def flush(self, limit=None):
+        items = list(islice(self.pending.items(), limit))
+        for node, _ in items:
+            del self.pending[node]
+        if items:
+            self.show(items)
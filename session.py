@@ -0,0 +1,13 @@
+# Utilisateur connecté. Gardé en mémoire, propre à chaque instance de
+# l'application : deux sessions ouvertes sur le même poste ne se partagent
+# plus l'utilisateur courant (ancien fichier current_user.txt)
+_current_user = None
+
+
+def get_current_user():
+    return _current_user
+
+
+def set_current_user(username):
+    global _current_user
+    _current_user = username
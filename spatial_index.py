@@ -0,0 +1,236 @@
+import math
+
+import numpy as np
+
+from graph_operations import LOOP_RADIUS
+
+HIT_RADIUS = 0.05  # Distance maximale d'un clic à une arête (coordonnées des données)
+DEFAULT_CELL = 0.05
+MIN_CELL = 1e-4
+NODES_PER_CELL = 2
+EDGE_SAMPLES = 16  # Cases visées par arête de longueur moyenne
+REBUILD_FACTOR = 4
+
+
+class SpatialIndex:
+    # Grille uniforme (dict de cases) pour trouver le sommet ou l'arête sous
+    # un clic sans parcourir tout le graphe :
+    # - chaque sommet est rangé dans la case de sa position ;
+    # - chaque arête est rangée dans toutes les cases que son segment traverse
+    #   (grille construite au premier clic sur une arête).
+    # Une recherche parcourt des anneaux de cases autour du clic et s'arrête
+    # dès qu'aucun anneau plus lointain ne peut contenir mieux. Ajouts et
+    # suppressions sont incrémentaux ; rebuild() après un chargement
+    def __init__(self, G=None, pos=None):
+        self.rebuild(G, pos)
+
+    def rebuild(self, G=None, pos=None):
+        self.G = G
+        self.points = dict(pos or {})
+        self.cell = DEFAULT_CELL
+        if len(self.points) > 1:
+            xy = np.array(list(self.points.values()), dtype=float)
+            width, height = xy.max(axis=0) - xy.min(axis=0)
+            area = max(width, MIN_CELL) * max(height, MIN_CELL)
+            self.cell = max(math.sqrt(area * NODES_PER_CELL / len(self.points)), MIN_CELL)
+        self.node_cells = {}
+        self.bounds = None
+        for node, (x, y) in self.points.items():
+            self._insert_node(node, x, y)
+        self.built_size = max(len(self.points), 256)
+        self.edge_cells = None  # Construite à la demande (_build_edges)
+
+    def _cell_of(self, x, y, cell):
+        return math.floor(x / cell), math.floor(y / cell)
+
+    def _insert_node(self, node, x, y):
+        i, j = self._cell_of(x, y, self.cell)
+        self.node_cells.setdefault((i, j), set()).add(node)
+        if self.bounds is None:
+            self.bounds = [i, i, j, j]
+        else:
+            bounds = self.bounds
+            bounds[0], bounds[1] = min(bounds[0], i), max(bounds[1], i)
+            bounds[2], bounds[3] = min(bounds[2], j), max(bounds[3], j)
+
+    def add_node(self, node, xy):
+        x, y = xy
+        self.points[node] = (x, y)
+        if len(self.points) > REBUILD_FACTOR * self.built_size:
+            # Grille devenue trop grossière pour le nombre de sommets
+            self.rebuild(self.G, self.points)
+        else:
+            self._insert_node(node, x, y)
+
+    def remove_node(self, node):
+        # À appeler avant G.remove_node : les arêtes incidentes sont lues dans G
+        if node not in self.points:
+            return
+        if self.edge_cells is not None and self.G is not None and node in self.G:
+            incident = list(self.G.edges(node))
+            if self.G.is_directed():
+                incident += list(self.G.in_edges(node))
+            for u, v in incident:
+                self.remove_edge(u, v)
+        cell = self._cell_of(*self.points.pop(node), self.cell)
+        members = self.node_cells.get(cell)
+        if members is not None:
+            members.discard(node)
+            if not members:
+                del self.node_cells[cell]
+
+    def add_edge(self, u, v):
+        if self.edge_cells is None:
+            return
+        key = (u, v)
+        if key in self.edge_keys:
+            return
+        cells = self._segment_cells(u, v)
+        self.edge_keys[key] = cells
+        for cell in cells:
+            self.edge_cells.setdefault(cell, set()).add(key)
+
+    def remove_edge(self, u, v):
+        if self.edge_cells is None:
+            return
+        for cell in self.edge_keys.pop((u, v), ()):
+            members = self.edge_cells.get(cell)
+            if members is not None:
+                members.discard((u, v))
+                if not members:
+                    del self.edge_cells[cell]
+
+    def nearest_node(self, x, y):
+        # Sommet le plus proche de (x, y), ou None si l'index est vide
+        if not self.points:
+            return None
+        ci, cj = self._cell_of(x, y, self.cell)
+        imin, imax, jmin, jmax = self.bounds
+        last_ring = max(ci - imin, imax - ci, cj - jmin, jmax - cj, 0)
+        best, best_distance = None, math.inf
+        for ring in range(last_ring + 1):
+            if 8 * ring > len(self.node_cells):
+                # Clic loin des sommets : parcourir les cases occupées coûte moins
+                return self._scan_nodes(x, y)
+            for cell in _ring(ci, cj, ring):
+                for node in self.node_cells.get(cell, ()):
+                    px, py = self.points[node]
+                    distance = math.hypot(px - x, py - y)
+                    if distance < best_distance:
+                        best, best_distance = node, distance
+            # Les anneaux suivants sont à au moins ring * cell du clic
+            if best is not None and best_distance <= ring * self.cell:
+                break
+        return best
+
+    def _scan_nodes(self, x, y):
+        return min(
+            self.points,
+            key=lambda node: math.hypot(self.points[node][0] - x, self.points[node][1] - y),
+        )
+
+    def nearest_edge(self, x, y, radius=HIT_RADIUS):
+        # Arête (u, v) la plus proche à moins de radius de (x, y), sinon None
+        if self.G is None:
+            return None
+        if self.edge_cells is None:
+            self._build_edges()
+        if not self.edge_keys:
+            return None
+        cell = self.edge_cell
+        ci, cj = self._cell_of(x, y, cell)
+        # Un anneau de marge : l'échantillonnage des segments (tous les
+        # quarts de case) peut manquer une case effleurée sur moins d'un
+        # quart de case, d'où aussi le huitième de case retranché ci-dessous
+        last_ring = math.ceil(radius / cell) + 1
+        best, best_distance, seen = None, radius, set()
+        for ring in range(last_ring + 1):
+            for ring_cell in _ring(ci, cj, ring):
+                for key in self.edge_cells.get(ring_cell, ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    distance = self._edge_distance(key, x, y)
+                    if distance < best_distance:
+                        best, best_distance = key, distance
+            if best is not None and best_distance <= (ring - 0.125) * cell:
+                break
+        return best
+
+    def _edge_distance(self, key, x, y):
+        u, v = key
+        x1, y1 = self.points[u]
+        if u == v:
+            # Boucle : cercle posé au-dessus du sommet (graph_operations)
+            return abs(math.hypot(x - x1, y - y1 - LOOP_RADIUS) - LOOP_RADIUS)
+        x2, y2 = self.points[v]
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy
+        t = 0.0 if length2 == 0 else min(max(((x - x1) * dx + (y - y1) * dy) / length2, 0.0), 1.0)
+        return math.hypot(x - x1 - t * dx, y - y1 - t * dy)
+
+    def _build_edges(self):
+        # Taille de case tirée de la longueur moyenne des arêtes : une arête
+        # occupe une quinzaine de cases, et une case reste plus petite que le
+        # rayon de clic. Les segments sont échantillonnés en une passe NumPy
+        edges = [(u, v) for u, v in self.G.edges() if u in self.points and v in self.points]
+        self.edge_cells, self.edge_keys = {}, {}
+        self.edge_cell = min(self.cell, HIT_RADIUS)
+        loops = [(u, v) for u, v in edges if u == v]
+        edges = [(u, v) for u, v in edges if u != v]
+        if edges:
+            src = np.array([self.points[u] for u, _ in edges], dtype=float)
+            dst = np.array([self.points[v] for _, v in edges], dtype=float)
+            length = np.hypot(*(dst - src).T)
+            self.edge_cell = min(max(self.cell, length.mean() / EDGE_SAMPLES), HIT_RADIUS)
+            steps = np.maximum(1, np.ceil(4 * length / self.edge_cell)).astype(np.int64)
+            edge_ids = np.repeat(np.arange(len(edges)), steps + 1)
+            first = np.repeat(np.cumsum(steps + 1) - (steps + 1), steps + 1)
+            t = (np.arange(len(edge_ids)) - first) / np.repeat(steps, steps + 1)
+            samples = src[edge_ids] + t[:, None] * (dst - src)[edge_ids]
+            cells = np.floor(samples / self.edge_cell).astype(np.int64)
+            # Un segment ne repasse jamais par une case : seuls les
+            # changements de case (ou d'arête) sont gardés
+            keep = np.ones(len(edge_ids), dtype=bool)
+            keep[1:] = (edge_ids[1:] != edge_ids[:-1]) | (cells[1:] != cells[:-1]).any(axis=1)
+            for edge_id, i, j in zip(
+                edge_ids[keep].tolist(), *cells[keep].T.tolist()
+            ):
+                key = edges[edge_id]
+                self.edge_keys.setdefault(key, []).append((i, j))
+                self.edge_cells.setdefault((i, j), set()).add(key)
+        for u, v in loops:
+            self.add_edge(u, v)
+
+    def _segment_cells(self, u, v):
+        # Cases traversées par le segment (u, v), échantillonné tous les
+        # quarts de case (comme _build_edges) ; une boucle occupe les cases
+        # de son cercle
+        cell = self.edge_cell
+        x1, y1 = self.points[u]
+        if u == v:
+            i0, j0 = self._cell_of(x1 - LOOP_RADIUS, y1, cell)
+            i1, j1 = self._cell_of(x1 + LOOP_RADIUS, y1 + 2 * LOOP_RADIUS, cell)
+            return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+        x2, y2 = self.points[v]
+        steps = max(1, math.ceil(4 * math.hypot(x2 - x1, y2 - y1) / cell))
+        cells = []
+        for step in range(steps + 1):
+            t = step / steps
+            c = self._cell_of(x1 + t * (x2 - x1), y1 + t * (y2 - y1), cell)
+            if not cells or cells[-1] != c:
+                cells.append(c)
+        return cells
+
+
+def _ring(ci, cj, ring):
+    # Cases à distance de Tchebychev exactement ring de (ci, cj)
+    if ring == 0:
+        yield ci, cj
+        return
+    for i in range(ci - ring, ci + ring + 1):
+        yield i, cj - ring
+        yield i, cj + ring
+    for j in range(cj - ring + 1, cj + ring):
+        yield ci - ring, j
+        yield ci + ring, j
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import time
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
+
+# Budget de temps jusqu'au premier affichage de la fenêtre de connexion
+STARTUP_BUDGET_MS = 500
+
+
+def startup_budget_ms(argv):
+    for arg in argv:
+        if arg.startswith("--startup-budget="):
+            return float(arg.split("=", 1)[1])
+    return STARTUP_BUDGET_MS
+
+
+def run_with_import_times(argv, top=15):
+    # Relance l'application avec -X importtime et résume le coût de chaque import
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv], stderr=subprocess.PIPE, text=True
+    )
+    imports = []
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(fields[1]), int(fields[0]), depth, name.strip()))
+
+    print("\nImports les plus coûteux (cumulé / propre, en ms) :")
+    for cumulative, own, depth, name in sorted(
+        (entry for entry in imports if entry[2] <= 1), reverse=True
+    )[:top]:
+        print(f"  {cumulative / 1000:8.1f} {own / 1000:8.1f}  {'  ' * depth}{name}")
+    return child.returncode
+
+
+class _FirstPaintFilter(QObject):
+    def __init__(self, app, started, budget_ms):
+        super().__init__()
+        self.app = app
+        self.started = started
+        self.budget_ms = budget_ms
+        self.done = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and not self.done:
+            self.done = True
+            elapsed_ms = (time.perf_counter() - self.started) * 1000
+            within = elapsed_ms <= self.budget_ms
+            print(
+                f"Premier affichage après {elapsed_ms:.0f} ms "
+                f"(budget {self.budget_ms:.0f} ms) : {'OK' if within else 'DÉPASSÉ'}"
+            )
+            QTimer.singleShot(0, lambda: self.app.exit(0 if within else 1))
+        return False
+
+
+def report_first_paint(app, window, started, budget_ms=STARTUP_BUDGET_MS):
+    # Mesure le temps entre le lancement et le premier paint de window, puis quitte
+    window._first_paint_filter = _FirstPaintFilter(app, started, budget_ms)
+    window.installEventFilter(window._first_paint_filter)
@@ -0,0 +1,269 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+
+from file_lock import FileLock, temp_path
+
+DB_PATH = "user_data.db"
+LEGACY_PATH = "user_data.pkl"
+SCHEMA_VERSION = 3
+
+
+class GraphStore:
+    # Stockage SQLite (mode WAL) : une ligne par utilisateur et une ligne par
+    # graphe ; le contenu de chaque graphe est un fichier binaire à part
+    # (graph_format) projeté en mémoire au chargement, donc sauvegarder ou
+    # charger un graphe ne touche que ce graphe.
+    # Plusieurs instances peuvent partager la base : un graphe est écrit dans
+    # un fichier temporaire unique, renommé sous le verrou du graphe (lock) ;
+    # les lectures ne prennent aucun verrou
+    def __init__(self, path=DB_PATH, legacy_path=LEGACY_PATH):
+        self.path = path
+        self.graphs_dir = os.path.splitext(path)[0] + "_graphs"
+        os.makedirs(self.graphs_dir, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "username TEXT PRIMARY KEY, password TEXT NOT NULL)"
+            )
+        self._migrate()
+        self._import_legacy(legacy_path)
+
+    def _migrate(self):
+        # Une étape par transaction BEGIN IMMEDIATE : si deux instances
+        # démarrent ensemble, la seconde attend puis relit la version
+        steps = {2: self._migrate_v2, 3: self._migrate_v3}
+        while True:
+            with self._immediate():
+                version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+                if version >= SCHEMA_VERSION:
+                    return
+                target = max(version, 1) + 1
+                steps[target]()
+                self.conn.execute(f"PRAGMA user_version = {target}")
+
+    def _immediate(self):
+        # Transaction qui prend tout de suite le verrou d'écriture de la base
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def _migrate_v2(self):
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(graphs)")]
+        self.conn.execute(
+            "CREATE TABLE graphs_v2 ("
+            "username TEXT NOT NULL, name TEXT NOT NULL, file TEXT NOT NULL, "
+            "PRIMARY KEY (username, name))"
+        )
+        if "data" in columns:
+            # Version 1 : graphes picklés dans la colonne data
+            from graph_format import legacy_to_arrays
+
+            rows = self.conn.execute(
+                "SELECT username, name, data FROM graphs ORDER BY rowid"
+            ).fetchall()
+            for username, name, data in rows:
+                path = self._graph_path(username, name)
+                os.replace(self._write_temp(path, legacy_to_arrays(pickle.loads(data))), path)
+                self.conn.execute(
+                    "INSERT INTO graphs_v2 (username, name, file) VALUES (?, ?, ?)",
+                    (username, name, os.path.basename(path)),
+                )
+        self.conn.execute("DROP TABLE IF EXISTS graphs")
+        self.conn.execute("ALTER TABLE graphs_v2 RENAME TO graphs")
+
+    def _migrate_v3(self):
+        # Version 3 : index de métadonnées pour lister sans ouvrir les graphes
+        from graph_format import read_graph_header
+
+        for column in ("node_count", "edge_count", "size"):
+            self.conn.execute(
+                f"ALTER TABLE graphs ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+            )
+        self.conn.execute(
+            "ALTER TABLE graphs ADD COLUMN modified REAL NOT NULL DEFAULT 0"
+        )
+        rows = self.conn.execute("SELECT username, name, file FROM graphs").fetchall()
+        for username, name, file in rows:
+            path = os.path.join(self.graphs_dir, file)
+            header = read_graph_header(path)
+            self.conn.execute(
+                "UPDATE graphs SET node_count = ?, edge_count = ?, size = ?, modified = ? "
+                "WHERE username = ? AND name = ?",
+                (
+                    header["node_count"],
+                    header["edge_count"],
+                    os.path.getsize(path),
+                    os.path.getmtime(path),
+                    username,
+                    name,
+                ),
+            )
+
+    def _import_legacy(self, legacy_path):
+        # Reprise unique de l'ancien user_data.pkl si la base est vide
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        if self.conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+            return
+        from graph_format import legacy_to_arrays
+
+        with open(legacy_path, "rb") as file:
+            user_data = pickle.load(file)
+        with self._immediate():
+            # Revérifié sous le verrou : une autre instance a pu importer entre-temps
+            if self.conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return
+            for username, user in user_data.items():
+                self.conn.execute(
+                    "INSERT INTO users (username, password) VALUES (?, ?)",
+                    (username, user["password"]),
+                )
+                for name, graph_data in user.get("graphs", {}).items():
+                    path = self._graph_path(username, name)
+                    arrays = legacy_to_arrays(graph_data)
+                    os.replace(self._write_temp(path, arrays), path)
+                    self._upsert_row(username, name, path, arrays)
+
+    def _graph_path(self, username, name, extension=".gtg"):
+        digest = hashlib.sha1(f"{username}\0{name}".encode()).hexdigest()
+        return os.path.join(self.graphs_dir, digest + extension)
+
+    def journal_path(self, username, name):
+        # Journal des modifications d'un graphe ; name=None : graphe pas encore
+        # enregistré (brouillon, un seul par utilisateur)
+        return self._graph_path(username, name or "", ".journal")
+
+    def lock(self, username, name):
+        # Verrou inter-processus d'un graphe : fichier, ligne et journal
+        return FileLock(self.journal_path(username, name) + ".lock")
+
+    def _write_temp(self, path, arrays):
+        # Écriture dans un fichier temporaire unique : le fichier en place
+        # reste intact tant qu'il n'est pas remplacé par os.replace
+        from graph_format import write_graph_file
+
+        tmp = temp_path(path)
+        try:
+            write_graph_file(tmp, arrays)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return tmp
+
+    def get_password(self, username):
+        row = self.conn.execute(
+            "SELECT password FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def user_exists(self, username):
+        return self.get_password(username) is not None
+
+    def add_user(self, username, password):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO users (username, password) VALUES (?, ?)",
+                (username, password),
+            )
+
+    def list_graphs(self, username):
+        rows = self.conn.execute(
+            "SELECT name FROM graphs WHERE username = ? ORDER BY rowid", (username,)
+        )
+        return [row[0] for row in rows]
+
+    def list_graph_info(self, username):
+        # Lecture de l'index uniquement : (nom, sommets, arcs, date, taille)
+        rows = self.conn.execute(
+            "SELECT name, node_count, edge_count, modified, size FROM graphs "
+            "WHERE username = ? ORDER BY rowid",
+            (username,),
+        )
+        return rows.fetchall()
+
+    def graph_exists(self, username, name):
+        row = self.conn.execute(
+            "SELECT 1 FROM graphs WHERE username = ? AND name = ?", (username, name)
+        ).fetchone()
+        return row is not None
+
+    def load_graph(self, username, name):
+        # Renvoie les tableaux du graphe (projetés en mémoire), ou None
+        from graph_format import read_graph_file
+
+        row = self.conn.execute(
+            "SELECT file FROM graphs WHERE username = ? AND name = ?", (username, name)
+        ).fetchone()
+        return read_graph_file(os.path.join(self.graphs_dir, row[0])) if row else None
+
+    def journal_seq(self, username, name):
+        # Dernière entrée du journal incluse dans le fichier du graphe
+        from graph_format import read_graph_header
+
+        path = self._graph_path(username, name)
+        return read_graph_header(path).get("journal_seq", 0) if os.path.exists(path) else None
+
+    def save_graph(self, username, name, arrays, expect_seq=None):
+        # Avec expect_seq, l'écriture n'a lieu que si le fichier en place
+        # inclut toujours le journal jusqu'à expect_seq (une autre instance n'a
+        # pas fusionné entre-temps) ; renvoie False sinon
+        path = self._graph_path(username, name)
+        tmp = self._write_temp(path, arrays)
+        try:
+            with self.lock(username, name):
+                if expect_seq is not None and self.journal_seq(username, name) != expect_seq:
+                    return False
+                os.replace(tmp, path)
+                with self.conn:
+                    self._upsert_row(username, name, path, arrays)
+            return True
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _upsert_row(self, username, name, path, arrays):
+        self.conn.execute(
+            "INSERT INTO graphs (username, name, file, node_count, edge_count, size, modified) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (username, name) DO UPDATE SET file = excluded.file, "
+            "node_count = excluded.node_count, edge_count = excluded.edge_count, "
+            "size = excluded.size, modified = excluded.modified",
+            (
+                username,
+                name,
+                os.path.basename(path),
+                len(arrays["nodes"]),
+                len(arrays["indices"]),
+                os.path.getsize(path),
+                time.time(),
+            ),
+        )
+
+    def delete_graph(self, username, name):
+        with self.lock(username, name):
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM graphs WHERE username = ? AND name = ?", (username, name)
+                )
+            for path in (self._graph_path(username, name), self.journal_path(username, name)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def close(self):
+        self.conn.close()
+
+
+_store = None
+
+
+def get_store():
+    # Base ouverte une seule fois, à la première utilisation
+    global _store
+    if _store is None:
+        _store = GraphStore()
+    return _store